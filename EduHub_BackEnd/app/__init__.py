@@ -1,10 +1,10 @@
-from flask import Flask
-from flasgger import Swagger
+from flask import Flask, jsonify
 from .extensions import db, bcrypt # Make sure bcrypt is initialized if used
 from .config import Config # Your application's config
 from flask_jwt_extended import JWTManager # Add this import
 from flask_migrate import Migrate # Add this import
 from flask_cors import CORS # Add this import
+from .utils.password_pool import PasswordPoolSaturated
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -25,162 +25,12 @@ def create_app(config_class=Config):
     # Initialize JWTManager
     jwt = JWTManager(app)
 
-    # Swagger Configuration
-    app.config['SWAGGER'] = {
-        'title': 'EduHub API',
-        'uiversion': 3, # Use OpenAPI 3
-        'openapi': '3.0.3', # More specific OpenAPI version
-        'version': '1.0.0',
-        'description': 'API for EduHub, an online educational consultancy firm. Provides user registration, login, and program recommendations.',
-        'termsOfService': 'http://example.com/terms', # Replace with your actual ToS URL
-        'contact': {
-            'name': 'EduHub API Support',
-            'url': 'http://example.com/support',
-            'email': 'support@example.com'
-        },
-        'license': {
-            'name': 'MIT License',
-            'url': 'https://opensource.org/licenses/MIT' # Example license
-        },
-        'components': {
-            'securitySchemes': {
-                'BearerAuth': {
-                    'type': 'http',
-                    'scheme': 'bearer',
-                    'bearerFormat': 'JWT'
-                }
-            },
-            'schemas': {
-                'ErrorResponse': {
-                    'type': 'object',
-                    'properties': {
-                        'error': {'type': 'string', 'example': 'Error message content'}
-                    }
-                },
-                'LoginRequest': {
-                    'type': 'object',
-                    'required': ['email', 'password'],
-                    'properties': {
-                        'email': {'type': 'string', 'format': 'email', 'example': 'user@example.com'},
-                        'password': {'type': 'string', 'format': 'password', 'example': 'strongpassword123'}
-                    }
-                },
-                'LoginSuccessResponse': {
-                    'type': 'object',
-                    'properties': {
-                        'message': {'type': 'string', 'example': 'Login successful'},
-                        'user_type': {'type': 'string', 'enum': ['admin', 'user', 'consultant'], 'example': 'user'},
-                        'user_id': {'type': 'integer', 'example': 1}
-                        # Token will be in an HttpOnly cookie, so not in response body
-                    }
-                },
-                'ProgramRecommendation': {
-                    'type': 'object',
-                    'properties': {
-                        'program_id': {'type': 'integer', 'example': 101},
-                        'program_name': {'type': 'string', 'example': 'Bachelor of Science in Computer Science'},
-                        'university': {'type': 'string', 'example': 'Tech University'},
-                        'description': {'type': 'string', 'example': 'A comprehensive program focusing on software development and computer theory.'},
-                        'degree_level': {'type': 'string', 'example': 'Bachelors'},
-                        'mode': {'type': 'string', 'example': 'Online'},
-                        'duration': {'type': 'string', 'example': '4 years'},
-                        'tuition_fees': {'type': 'string', 'example': '$15,000 per year'},
-                        'application_link': {'type': 'string', 'format': 'url', 'example': 'http://apply.techuniversity.edu/cs'}
-                    }
-                },
-                'BaseUserRegistrationRequest': {
-                    'type': 'object',
-                    'required': ['email', 'password'],
-                    'properties': {
-                        'email': {'type': 'string', 'format': 'email', 'example': 'newuser@example.com'},
-                        'password': {'type': 'string', 'format': 'password', 'minLength': 8, 'example': 'newpassword123'}
-                    }
-                },
-                'UserRegistrationRequest': {
-                    'allOf': [
-                        {'$ref': '#/components/schemas/BaseUserRegistrationRequest'},
-                        {
-                            'type': 'object',
-                            'required': ['phone', 'address', 'areas_of_interest', 'degree_level', 'mode'],
-                            'properties': {
-                                'phone': {'type': 'string', 'example': '123-456-7890'},
-                                'address': {'type': 'string', 'example': '123 Main St, Anytown, USA'},
-                                'areas_of_interest': {'type': 'array', 'items': {'type': 'string'}, 'example': ['AI', 'Web Development']},
-                                'degree_level': {'type': 'string', 'enum': ['Bachelors', 'Masters', 'PhD', 'Diploma', 'Certificate'], 'example': 'Bachelors'},
-                                'mode': {'type': 'string', 'enum': ['Online', 'On-Campus', 'Hybrid'], 'example': 'Online'}
-                            }
-                        }
-                    ]
-                },
-                'ConsultantRegistrationRequest': {
-                    'allOf': [
-                        {'$ref': '#/components/schemas/BaseUserRegistrationRequest'},
-                        {
-                            'type': 'object',
-                            'required': ['phone', 'address', 'shift', 'presence'],
-                            'properties': {
-                                'phone': {'type': 'string', 'example': '987-654-3210'},
-                                'address': {'type': 'string', 'example': '456 Oak Ave, Anytown, USA'},
-                                'shift': {'type': 'string', 'enum': ['Morning', 'Evening', 'Night'], 'example': 'Morning'},
-                                'presence': {'type': 'string', 'enum': ['Online', 'Offline'], 'example': 'Online'},
-                                'employment_type': {'type': 'string', 'enum': ['part-time', 'full-time'], 'example': 'part-time', 'description': 'Employment type affects available time slots. Part-time: 3 slots per day (morning). Full-time: 6 slots per day (morning and afternoon).'}
-                            }
-                        }
-                    ]
-                },
-                'AdminRegistrationRequest': { # Essentially the same as BaseUserRegistrationRequest
-                    'allOf': [
-                        {'$ref': '#/components/schemas/BaseUserRegistrationRequest'}
-                    ]
-                },
-                'BaseRegistrationSuccessResponse': {
-                    'type': 'object',
-                    'properties': {
-                        'message': {'type': 'string', 'example': 'user registered successfully'},
-                        'user_id': {'type': 'integer', 'example': 1}
-                    }
-                },
-                'UserRegistrationSuccessResponse': {
-                    'allOf': [
-                        {'$ref': '#/components/schemas/BaseRegistrationSuccessResponse'},
-                        {
-                            'type': 'object',
-                            'properties': {
-                                'recommendations': {
-                                    'type': 'array',
-                                    'items': {'$ref': '#/components/schemas/ProgramRecommendation'}
-                                },
-                                'recommendation_count': {'type': 'integer', 'example': 3}
-                            }
-                        }
-                    ]
-                },
-                'BookingResponse': {
-                    'type': 'object',
-                    'properties': {
-                        'booking_id': {'type': 'integer', 'example': 1},
-                        'consultant_name': {'type': 'string', 'example': 'consultant@example.com'},
-                        'date': {'type': 'string', 'format': 'date', 'example': '2025-06-25'},
-                        'time': {'type': 'string', 'example': '09:00 - 10:00'},
-                        'status': {'type': 'string', 'enum': ['Pending', 'Confirmed', 'Cancelled'], 'example': 'Pending'}
-                    }
-                },
-                'TimeSlotResponse': {
-                    'type': 'object',
-                    'properties': {
-                        'slot_id': {'type': 'integer', 'example': 1},
-                        'date': {'type': 'string', 'format': 'date', 'example': '2025-06-25'},
-                        'start_time': {'type': 'string', 'example': '09:00'},
-                        'end_time': {'type': 'string', 'example': '10:00'},
-                        'is_available': {'type': 'boolean', 'example': True}
-                    }
-                }
-            }
-        },
-        # If you want to protect all endpoints by default:
-        # 'security': [{'BearerAuth': []}]
-    }
-    swagger = Swagger(app) # Initialize Flasgger with the app
+    # API docs: Flasgger itself is only imported on the first /apidocs or /apispec_1.json request
+    if app.config.get('API_DOCS_ENABLED'):
+        from .utils.api_docs import SWAGGER
+        from .routes.api_docs import api_docs_bp
+        app.config.setdefault('SWAGGER', SWAGGER)
+        app.register_blueprint(api_docs_bp)
 
     # Import and register blueprints
     from .routes.auth import auth_bp
@@ -196,6 +46,13 @@ def create_app(config_class=Config):
     app.register_blueprint(booking_bp, url_prefix='/api/booking')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
+    # Register CLI commands (e.g. `flask slots roll`, `flask bookings sweep-holds`, `flask catalog import`)
+    from .commands import slots_cli, bookings_cli, analytics_cli, catalog_cli
+    app.cli.add_command(slots_cli)
+    app.cli.add_command(bookings_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(catalog_cli)
+
     # Add a custom route handler for CORS preflight requests
     @app.route('/api/consultant/stats', methods=['OPTIONS'])
     def handle_options_consultant_stats():
@@ -205,6 +62,13 @@ def create_app(config_class=Config):
         response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS,PATCH')
         return response
 
+    # Fail fast when the bcrypt pool is saturated instead of letting logins time out
+    @app.errorhandler(PasswordPoolSaturated)
+    def handle_password_pool_saturated(error):
+        response = jsonify({'error': 'Server is busy, please retry shortly'})
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response, 503
+
     # Add CORS headers to all responses
     @app.after_request
     def add_cors_headers(response):
@@ -0,0 +1,108 @@
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.utils.slot_scheduler import roll_slot_horizon, prune_expired_slots
+from app.utils.booking_slots import release_expired_holds
+from app.utils.analytics_rollups import refresh_rollups
+
+slots_cli = AppGroup('slots', help='Manage consultant time slots.')
+bookings_cli = AppGroup('bookings', help='Manage bookings.')
+analytics_cli = AppGroup('analytics', help='Maintain the admin analytics rollups.')
+catalog_cli = AppGroup('catalog', help='Manage the program and university catalog.')
+
+
+@slots_cli.command('roll')
+@click.option('--weeks', type=int, default=None, help='Horizon to keep filled (default: SLOT_HORIZON_WEEKS).')
+@click.option('--batch-size', type=int, default=None, help='Consultants per batch (default: SLOT_SCHEDULER_BATCH_SIZE).')
+@click.option('--loop', is_flag=True, help='Keep running as a worker instead of exiting after one pass.')
+@click.option('--interval', type=int, default=3600, show_default=True, help='Seconds between passes with --loop.')
+def roll_slots(weeks, batch_size, loop, interval):
+    """Generate slots up to the rolling horizon and prune expired unbooked slots."""
+    weeks = weeks or current_app.config.get('SLOT_HORIZON_WEEKS', 4)
+    batch_size = batch_size or current_app.config.get('SLOT_SCHEDULER_BATCH_SIZE', 100)
+    while True:
+        started = time.monotonic()
+        stats = roll_slot_horizon(weeks=weeks, batch_size=batch_size)
+        pruned = prune_expired_slots()
+        click.echo(
+            f"Processed {stats['consultants']} consultants: {stats['slots_created']} slots created, "
+            f"{pruned} expired slots pruned in {time.monotonic() - started:.2f}s"
+        )
+        if not loop:
+            break
+        time.sleep(interval)
+
+
+@bookings_cli.command('sweep-holds')
+@click.option('--batch-size', type=int, default=None, help='Holds released per transaction (default: BOOKING_HOLD_SWEEP_BATCH_SIZE).')
+@click.option('--loop', is_flag=True, help='Keep running as a worker instead of exiting after one pass.')
+@click.option('--interval', type=int, default=60, show_default=True, help='Seconds between passes with --loop.')
+def sweep_holds(batch_size, loop, interval):
+    """Cancel Pending bookings whose payment hold expired and free their slots."""
+    batch_size = batch_size or current_app.config.get('BOOKING_HOLD_SWEEP_BATCH_SIZE', 500)
+    while True:
+        started = time.monotonic()
+        released = release_expired_holds(batch_size=batch_size)
+        click.echo(f"Released {released} expired holds in {time.monotonic() - started:.2f}s")
+        if not loop:
+            break
+        time.sleep(interval)
+
+
+@analytics_cli.command('refresh')
+@click.option('--full', is_flag=True, help='Rebuild every day from scratch instead of refreshing incrementally.')
+@click.option('--loop', is_flag=True, help='Keep running as a worker instead of exiting after one pass.')
+@click.option('--interval', type=int, default=3600, show_default=True, help='Seconds between passes with --loop.')
+def refresh_analytics(full, loop, interval):
+    """Bring the daily booking and registration rollups up to yesterday."""
+    while True:
+        started = time.monotonic()
+        restated = refresh_rollups(full=full)
+        click.echo(
+            f"Restated {restated['bookings']} booking days and {restated['registrations']} registration days "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        if not loop:
+            break
+        full = False
+        time.sleep(interval)
+
+
+@catalog_cli.command('import')
+@click.option('--universities', 'universities_path', type=click.Path(exists=True, dir_okay=False), help='University .csv/.xlsx file.')
+@click.option('--programs', 'programs_path', type=click.Path(exists=True, dir_okay=False), help='Program .csv/.xlsx file.')
+@click.option('--chunk-size', type=int, default=None, help='Rows read and upserted per batch (default: CATALOG_IMPORT_CHUNK_SIZE).')
+@click.option('--sheet', default=None, help='Excel sheet to read (default: the active sheet).')
+def import_catalog_files(universities_path, programs_path, chunk_size, sheet):
+    """
+    Upsert universities and programs from spreadsheets, skipping unchanged rows.
+
+    Running web workers pick the changes up in their recommendations once
+    RECOMMENDATION_INDEX_TTL and then RECOMMENDATION_CACHE_TTL expire.
+    """
+    # Imported here so pandas is only loaded by this command
+    from app.utils.catalog_import import import_catalog, CatalogImportError
+
+    if not universities_path and not programs_path:
+        raise click.UsageError('Pass --universities and/or --programs.')
+    chunk_size = chunk_size or current_app.config.get('CATALOG_IMPORT_CHUNK_SIZE', 5000)
+    # Universities first, so programs never point at a university that is not loaded yet
+    for kind, path in (('universities', universities_path), ('programs', programs_path)):
+        if not path:
+            continue
+        try:
+            stats = import_catalog(path, kind, chunk_size=chunk_size, sheet_name=sheet)
+        except CatalogImportError as e:
+            raise click.ClickException(f"{path}: {e}")
+        rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+        click.echo(
+            f"{kind}: {stats['rows']} rows in {stats['seconds']:.2f}s ({rate:,.0f} rows/s): "
+            f"{stats['inserted']} inserted, {stats['updated']} updated, {stats['unchanged']} unchanged, "
+            f"{stats['invalid']} invalid, {stats['duplicate']} duplicate"
+        )
+    config = current_app.config
+    click.echo(
+        f"Running web workers will recommend the changes within "
+        f"{config.get('RECOMMENDATION_INDEX_TTL', 300) + config.get('RECOMMENDATION_CACHE_TTL', 120)}s."
+    )
@@ -7,4 +7,31 @@ class Config:
     JWT_COOKIE_SECURE = False # Set to True in production over HTTPS
     JWT_COOKIE_SAMESITE = None # Disable SameSite to allow cross-site cookie usage
     JWT_COOKIE_HTTPONLY = False # Make access token cookie inaccessible to JavaScript
-    JWT_COOKIE_CSRF_PROTECT = False # Disable CSRF protection for cookies for now
\ No newline at end of file
+    JWT_COOKIE_CSRF_PROTECT = False # Disable CSRF protection for cookies for now
+    RECOMMENDATION_INDEX_TTL = 300 # Seconds before the in-memory program index is fully rebuilt
+    RECOMMENDATION_CACHE_SIZE = 1024 # Max cached (areas, degree_level, mode) profiles per process
+    RECOMMENDATION_CACHE_TTL = 120 # Seconds a cached recommendation list stays valid
+    RECOMMENDATIONS_ASYNC = False # Compute login/registration recommendations on a worker pool, served from /api/recommendations
+    RECOMMENDATION_WORKERS = 4 # Size of the recommendation worker pool
+    BCRYPT_LOG_ROUNDS = 12 # bcrypt cost factor for new password hashes
+    BCRYPT_POOL_WORKERS = 4 # Threads dedicated to bcrypt hashing/verification
+    BCRYPT_POOL_QUEUE_SIZE = 64 # Jobs allowed to wait for a bcrypt thread before answering 503
+    BCRYPT_POOL_TIMEOUT = 5.0 # Seconds a request waits for its bcrypt job before answering 503
+    BCRYPT_POOL_RETRY_AFTER = 1 # Retry-After seconds sent with the 503
+    BCRYPT_REHASH_ON_LOGIN = True # Re-hash passwords stored at a different cost factor after a successful login
+    SLOT_HORIZON_WEEKS = 4 # Weeks of consultant time slots kept ahead by `flask slots roll`
+    SLOT_SCHEDULER_BATCH_SIZE = 100 # Consultants processed per batch by the slot scheduler
+    SLOT_HOLIDAYS = [] # 'YYYY-MM-DD' dates on which no consultant time slots are generated
+    BOOKING_HOLD_TTL = 900 # Seconds a Pending booking holds its slot while waiting for payment
+    BOOKING_HOLD_SWEEP_BATCH_SIZE = 500 # Expired holds released per transaction by `flask bookings sweep-holds`
+    AVAILABILITY_CACHE_SIZE = 20000 # Max cached (consultant, day) availability bitmaps per process
+    AVAILABILITY_CACHE_TTL = 60 # Seconds before a cached day is reloaded (bounds staleness from other processes)
+    ANALYTICS_SNAPSHOT_TTL = 10 # Seconds admin analytics results are shared between dashboard polls
+    ANALYTICS_ROLLUP_RESTATE_DAYS = 7 # Closed days recomputed on every rollup refresh, whether or not rows changed
+    ANALYTICS_ROLLUP_LAG = 300 # Seconds of overlap between refreshes, for transactions still in flight
+    ADMIN_ROLE_VERIFY = True # Check admin JWT claims against the cached admin ids (False: trust the signed claim alone)
+    ADMIN_ROLE_CACHE_TTL = 60 # Seconds the admin id set is reused; bounds how long a removed admin keeps access
+    CONSULTANT_DIRECTORY_CACHE_SIZE = 256 # Max cached consultant directory pages (filter/projection/cursor combinations)
+    CONSULTANT_DIRECTORY_CACHE_TTL = 300 # Seconds a directory page is reused; bounds staleness from other processes
+    CATALOG_IMPORT_CHUNK_SIZE = 5000 # Rows read, hashed and upserted per batch by `flask catalog import`
+    API_DOCS_ENABLED = True # Serve /apidocs and /apispec_1.json; set False in production to skip the docs routes entirely
@@ -1,12 +1,6 @@
 import datetime
-import re
-import pandas as pd
-from app.extensions import db
-from flask_bcrypt import Bcrypt
-import pandas as pd
-import re
-
-bcrypt = Bcrypt()
+from app.extensions import db, bcrypt
+from app.utils.password_pool import password_pool, needs_rehash, schedule_rehash
 
 # ------------------- BASE USER -------------------
 class BaseUser(db.Model):
@@ -24,11 +18,16 @@ class BaseUser(db.Model):
         'polymorphic_on': user_type
     }
 
+    # Hashing runs on the bounded bcrypt pool (cost factor: BCRYPT_LOG_ROUNDS)
     def set_password(self, raw_password):
-        self.password = bcrypt.generate_password_hash(raw_password).decode('utf-8')
+        self.password = password_pool().run(bcrypt.generate_password_hash, raw_password).decode('utf-8')
 
     def check_password(self, raw_password):
-        return bcrypt.check_password_hash(self.password, raw_password)
+        valid = password_pool().run(bcrypt.check_password_hash, self.password, raw_password)
+        # Move hashes created at an older cost factor to the current one, without a reset
+        if valid and needs_rehash(self.password):
+            schedule_rehash(self.id, self.password, raw_password)
+        return valid
 
 # ------------------- ADMIN MODEL -------------------
 class Admin(BaseUser):
@@ -47,15 +46,38 @@ class User(BaseUser):
     id = db.Column(db.Integer, db.ForeignKey('base_users.id'), primary_key=True)
     phone = db.Column(db.String(15), nullable=True)
     address = db.Column(db.String(255), nullable=True)
-    areas_of_interest = db.Column(db.String(255), nullable=True)
+    areas_of_interest = db.Column(db.String(255), nullable=True)  # Display copy of `interests`, e.g. "AI, Web Development"
     degree_level = db.Column(db.String(50), nullable=True)
     mode = db.Column(db.String(50), nullable=True)
-    created_at = db.Column(db.DateTime, server_default=db.func.now())
+    created_at = db.Column(db.DateTime, server_default=db.func.now(), index=True)
+
+    interests = db.relationship('Area', secondary='user_interests')
 
     __mapper_args__ = {
         'polymorphic_identity': 'user'
     }
 
+# ------------------- AREAS OF INTEREST -------------------
+# Canonical vocabulary of the areas students list at registration
+class Area(db.Model):
+    __tablename__ = 'areas'
+
+    area_id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(255), nullable=False, unique=True)  # Normalized key: stripped, lowercase
+    label = db.Column(db.String(255), nullable=False)  # Spelling of the first student who entered it
+
+    def __repr__(self):
+        return f"Area('{self.label}')"
+
+
+user_interests = db.Table(
+    'user_interests',
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('area_id', db.Integer, db.ForeignKey('areas.area_id'), primary_key=True),
+    # Students per area (popular areas) without touching the primary key order
+    db.Index('ix_user_interests_area_id', 'area_id')
+)
+
 # ------------------- CONSULTANT MODEL -------------------
 class Consultant(BaseUser):
     __tablename__ = 'consultants'
@@ -84,6 +106,7 @@ class Program(db.Model):
     scholarships = db.Column(db.String(255), nullable=True)
     area_of_study = db.Column(db.String(255), nullable=False)
     date_added = db.Column(db.DateTime, server_default=db.func.now())
+    row_hash = db.Column(db.String(16), nullable=True) # Hash of the imported row; unchanged rows are skipped on re-import
     def __repr__(self):
         return f"Program('{self.name}', '{self.degree_level}', '{self.area_of_study}')"
 # ------------------- UNIVERSITY MODEL -------------------
@@ -95,12 +118,21 @@ class University(db.Model):
     phone = db.Column(db.String(50), nullable=True)
     email = db.Column(db.String(255), nullable=True)
     date_added = db.Column(db.DateTime, server_default=db.func.now())
+    row_hash = db.Column(db.String(16), nullable=True) # Hash of the imported row; unchanged rows are skipped on re-import
 
     def __repr__(self):
         return f"University('{self.name}', '{self.email}')"
     
 class ConsultantTimeSlot(db.Model):
     __tablename__ = 'consultant_time_slot'
+    __table_args__ = (
+        # One slot per consultant per start time; makes slot generation idempotent
+        db.UniqueConstraint('consultant_id', 'date', 'start_time', name='uq_consultant_time_slot_start'),
+        # Free/booked slot counts per consultant (utilization analytics)
+        db.Index('ix_consultant_time_slot_consultant_available', 'consultant_id', 'is_available', 'date'),
+        # Date-range scans across all consultants (slot generation, expired slot pruning)
+        db.Index('ix_consultant_time_slot_date_available', 'date', 'is_available'),
+    )
     slot_id = db.Column(db.Integer, primary_key=True)
     consultant_id = db.Column(db.Integer, db.ForeignKey('consultants.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
@@ -114,14 +146,43 @@ class ConsultantTimeSlot(db.Model):
         return f"TimeSlot(Consultant: {self.consultant_id}, Date: {self.date}, Time: {self.start_time}-{self.end_time}, Available: {self.is_available})"
 
 
+class ConsultantSlotWatermark(db.Model):
+    __tablename__ = 'consultant_slot_watermarks'
+    consultant_id = db.Column(db.Integer, db.ForeignKey('consultants.id'), primary_key=True)
+    generated_through = db.Column(db.Date, nullable=False)  # Last date slots have been generated for
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
+
+    def __repr__(self):
+        return f"SlotWatermark(Consultant: {self.consultant_id}, Through: {self.generated_through})"
+
+
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        # A consultant's bookings, optionally by status (consultant getBookings, consultant analytics)
+        db.Index('ix_bookings_consultant_status', 'consultant_id', 'status'),
+        # Bookings of a slot (popular times join, pruning unbooked slots)
+        db.Index('ix_bookings_time_slot_id', 'time_slot_id'),
+        # Recent-booking windows (admin analytics); the status column lets the live
+        # part of the rollup reports count by status from the index alone
+        db.Index('ix_bookings_booking_date_status', 'booking_date', 'status'),
+        # Rows changed since the last analytics rollup refresh
+        db.Index('ix_bookings_updated_at', 'updated_at'),
+        # At most one non-cancelled booking per slot; named as in migration 5f1b9c3e7a22
+        db.UniqueConstraint('active_time_slot_id', name='uq_bookings_active_time_slot_id'),
+    )
     booking_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     consultant_id = db.Column(db.Integer, db.ForeignKey('consultants.id'), nullable=False)
     time_slot_id = db.Column(db.Integer, db.ForeignKey('consultant_time_slot.slot_id'), nullable=False)
     status = db.Column(db.String(50), default='Pending')  # Status can be 'Pending', 'Confirmed', 'Cancelled'
+    # Equals time_slot_id while the booking is not cancelled, NULL afterwards. The unique
+    # constraint allows at most one non-cancelled booking per slot (NULLs never collide).
+    active_time_slot_id = db.Column(db.Integer, nullable=True)
+    # Pending bookings hold their slot until this time (NULL: no expiry); cleared once paid or cancelled
+    hold_expires_at = db.Column(db.DateTime, nullable=True, index=True)
     booking_date = db.Column(db.DateTime, server_default=db.func.now())  # When the booking was made
+    updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())  # Last change (status, hold)
     
     user = db.relationship('User', backref='bookings')
     consultant = db.relationship('Consultant', backref='bookings')
@@ -130,15 +191,48 @@ class Booking(db.Model):
     def __repr__(self):
         return f"Booking(User: {self.user_id}, Consultant: {self.consultant_id}, Status: {self.status})"
 
-# Helper function to clean fee string to float
-def clean_fee(fee_str):
-    if pd.isna(fee_str): # Check for NaN or None
-        return None
-    # Convert to string to ensure .replace() works, then clean
-    fee_str = str(fee_str).upper()
-    # Remove "LKR", "KR", commas, and trim whitespace
-    cleaned_fee = re.sub(r'[LKR\s,]', '', fee_str)
-    try:
-        return float(cleaned_fee)
-    except ValueError:
-        return None # Return None if conversion fails
\ No newline at end of file
+
+# ------------------- ANALYTICS ROLLUPS -------------------
+# Daily aggregates maintained by `flask analytics refresh` (app/utils/analytics_rollups.py).
+# Each closed day is fully restated from the raw rows, so there is one row per key and day.
+class BookingDailyStat(db.Model):
+    __tablename__ = 'booking_daily_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)  # Date of booking_date
+    status = db.Column(db.String(50), nullable=True)
+    booking_count = db.Column(db.Integer, nullable=False)
+
+
+class BookingStartTimeDailyStat(db.Model):
+    __tablename__ = 'booking_start_time_daily_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)  # Date of booking_date
+    start_time = db.Column(db.String(10), nullable=False)
+    booking_count = db.Column(db.Integer, nullable=False)
+
+
+class RegistrationDailyStat(db.Model):
+    __tablename__ = 'registration_daily_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False, index=True)  # Date of users.created_at
+    degree_level = db.Column(db.String(50), nullable=True)
+    mode = db.Column(db.String(50), nullable=True)
+    user_count = db.Column(db.Integer, nullable=False)
+
+
+class AnalyticsRollupWatermark(db.Model):
+    __tablename__ = 'analytics_rollup_watermarks'
+    name = db.Column(db.String(50), primary_key=True)  # 'bookings' or 'registrations'
+    refreshed_at = db.Column(db.DateTime, nullable=False)  # Database time the last refresh started
+    closed_through = db.Column(db.Date, nullable=False)  # Last day covered by the rollup tables
+
+    def __repr__(self):
+        return f"RollupWatermark({self.name}: through {self.closed_through})"
+
+# clean_fee moved to app/utils/ingestion.py; resolved on first access (PEP 562)
+# so existing `from app.models import clean_fee` imports keep working
+def __getattr__(name):
+    if name == 'clean_fee':
+        from app.utils.ingestion import clean_fee
+        return clean_fee
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,63 +1,59 @@
-from flask import Blueprint, jsonify, request
-from app.models import Program, University, Consultant, Booking, ConsultantTimeSlot, User, Admin
-from app.extensions import db
-from sqlalchemy import func
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime, date, timedelta
-from app.utils.time_slot_generator import generate_consultant_time_slots
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+from app.models import Booking
+from datetime import datetime, timedelta
+from app.utils.booking_queries import booking_rows_query, parse_keyset_args, apply_keyset, KeysetError
+from app.utils.analytics import analytics_snapshot, overview_counts, consultant_stats
+from app.utils.analytics_rollups import daily_counts, booking_status_counts, booking_start_time_counts, registration_counts
+from app.utils.interests import popular_areas
+from app.utils.jwt_utils import role_required
+import csv
+import io
+import json
 
 booking_bp = Blueprint('admin', __name__)
 
-def check_admin_access():
-    user_id = get_jwt_identity()
-    if not user_id:
-        return False
-    
-    admin_user = Admin.query.filter_by(id=user_id).first()
-    return admin_user is not None
+# Admin-only views; the 403 body keeps this blueprint's {"message": ...} shape
+admin_required = role_required('admin', error_key='message')
+
+def serialize_admin_booking(row):
+    return {
+        'id': row.booking_id,
+        'user_id': row.user_id,
+        'user_name': row.user_name or "Unknown",
+        'consultant_id': row.consultant_id,
+        'consultant_name': row.consultant_name or "Unknown",
+        'time_slot_id': row.time_slot_id,
+        'status': row.status,
+        'created_at': row.booking_date.isoformat() if row.booking_date else None,
+        'date': row.date.isoformat() if row.date else None,
+        'start_time': row.start_time,
+        'end_time': row.end_time
+    }
+
+ADMIN_BOOKING_FIELDS = [
+    'id', 'user_id', 'user_name', 'consultant_id', 'consultant_name', 'time_slot_id',
+    'status', 'created_at', 'date', 'start_time', 'end_time'
+]
 
 @booking_bp.route('/getBookings', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_bookings():
-    if not check_admin_access():
-        return jsonify({"message": "Unauthorized access"}), 403
+    try:
+        after, limit = parse_keyset_args()
+    except KeysetError as e:
+        return jsonify({"error": str(e)}), 400
     
     try:
-        bookings = Booking.query.all()
-        booking_list = []
+        # One joined query (bookings + users + consultants + time slots) instead of 3 lookups per booking
+        rows = apply_keyset(booking_rows_query(), Booking.booking_id, after, limit).all()
+        booking_list = [serialize_admin_booking(row) for row in rows]
         
-        for booking in bookings:
-            user = User.query.get(booking.user_id)
-            consultant = Consultant.query.get(booking.consultant_id)
-            time_slot = ConsultantTimeSlot.query.get(booking.time_slot_id)
-            
-            booking_data = {
-                'id': booking.booking_id,
-                'user_id': booking.user_id,
-                'user_name': user.name if user else "Unknown",
-                'consultant_id': booking.consultant_id,
-                'consultant_name': consultant.name if consultant else "Unknown",
-                'time_slot_id': booking.time_slot_id,
-                'status': booking.status,
-                'created_at': booking.booking_date.isoformat()
-            }
-            
-            if time_slot:
-                booking_data.update({
-                    'date': time_slot.date.isoformat(),
-                    'start_time': time_slot.start_time,
-                    'end_time': time_slot.end_time
-                })
-            else:
-                booking_data.update({
-                    'date': None,
-                    'start_time': None,
-                    'end_time': None
-                })
-                
-            booking_list.append(booking_data)
+        response_data = {"bookings": booking_list}
+        if limit is not None:
+            # Pass next_after back as ?after= to fetch the following page
+            response_data["next_after"] = booking_list[-1]['id'] if len(booking_list) == limit else None
         
-        return jsonify({"bookings": booking_list}), 200
+        return jsonify(response_data), 200
         
     except Exception as e:
         print(f"Get bookings error: {e}")
@@ -66,85 +62,86 @@ def get_bookings():
             "error": "Failed to fetch bookings"
         }), 500
 
-@booking_bp.route('/analytics/overview', methods=['GET'])
-@jwt_required()
-def get_analytics_overview():
-    if not check_admin_access():
-        return jsonify({"message": "Unauthorized access"}), 403
+@booking_bp.route('/getBookings/export', methods=['GET'])
+@admin_required
+def export_bookings():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({"error": "Invalid format. Use ndjson or csv"}), 400
     
-    # Get total counts
-    total_users = User.query.count()
-    total_consultants = Consultant.query.count()
-    total_bookings = Booking.query.count()
-    total_programs = Program.query.count()
+    def generate():
+        # Rows are serialized as they come off the cursor, never as one list
+        rows = booking_rows_query().order_by(Booking.booking_id).yield_per(1000)
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=ADMIN_BOOKING_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(serialize_admin_booking(row))
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            yield buffer.getvalue()
+        else:
+            for row in rows:
+                yield json.dumps(serialize_admin_booking(row)) + '\n'
     
-    # Get bookings by status
-    confirmed_bookings = Booking.query.filter_by(status='Confirmed').count()
-    pending_bookings = Booking.query.filter_by(status='Pending').count()
-    cancelled_bookings = Booking.query.filter_by(status='Cancelled').count()
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=bookings.{export_format}'
+    return response
+
+@booking_bp.route('/analytics/overview', methods=['GET'])
+@admin_required
+def get_analytics_overview():
+    # One statement for all counts, shared between dashboards for ANALYTICS_SNAPSHOT_TTL seconds
+    counts = analytics_snapshot('overview').get(overview_counts)
 
-    total_revenue = confirmed_bookings * 5000.0
-    
-    # Get recent activity (last 7 days)
-    week_ago = datetime.now() - timedelta(days=7)
-    recent_bookings = Booking.query.filter(Booking.booking_date >= week_ago).count()
-    recent_users = User.query.filter(User.created_at >= week_ago).count()
-    
     return jsonify({
         "overview": {
-            "total_users": total_users,
-            "total_consultants": total_consultants,
-            "total_bookings": total_bookings,
-            "total_programs": total_programs,
-            "confirmed_bookings": confirmed_bookings,
-            "pending_bookings": pending_bookings,
-            "cancelled_bookings": cancelled_bookings,
-            "total_revenue": total_revenue,
-            "recent_bookings": recent_bookings,
-            "recent_users": recent_users
+            "total_users": counts['total_users'],
+            "total_consultants": counts['total_consultants'],
+            "total_bookings": counts['total_bookings'],
+            "total_programs": counts['total_programs'],
+            "confirmed_bookings": counts['confirmed_bookings'],
+            "pending_bookings": counts['pending_bookings'],
+            "cancelled_bookings": counts['cancelled_bookings'],
+            "total_revenue": counts['confirmed_bookings'] * 5000.0,
+            "recent_bookings": counts['recent_bookings'],
+            "recent_users": counts['recent_users']
         }
     }), 200
 
 
 
 @booking_bp.route('/analytics/consultants', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_consultant_analytics():
-    if not check_admin_access():
-        return jsonify({"message": "Unauthorized access"}), 403
-    
+    # Optional window on the slot date (inclusive)
     try:
-        # Get top consultants by number of confirmed bookings
-        top_consultants = db.session.query(
-            Consultant.id,
-            Consultant.name,
-            Consultant.email,
-            func.count(Booking.booking_id).label('total_bookings'),
-            func.sum(func.case((Booking.status == 'Confirmed', 1), else_=0)).label('confirmed_bookings'),
-            (func.sum(func.case((Booking.status == 'Confirmed', 1), else_=0)) * 2000.0).label('revenue_generated')
-        ).outerjoin(Booking, Consultant.id == Booking.consultant_id).group_by(
-            Consultant.id, Consultant.name, Consultant.email
-        ).order_by(func.count(Booking.booking_id).desc()).all()
-        
+        start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date() if request.args.get('start_date') else None
+        end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date() if request.args.get('end_date') else None
+    except ValueError:
+        return jsonify({"message": "Invalid date format. Use YYYY-MM-DD"}), 400
+
+    try:
+        # Bookings and slot utilization for every consultant in one grouped query
+        rows = consultant_stats(start_date, end_date)
+
         # Get consultant utilization (booked vs available slots)
         consultant_utilization = []
-        for consultant in Consultant.query.all():
-            total_slots = ConsultantTimeSlot.query.filter_by(consultant_id=consultant.id).count()
-            booked_slots = ConsultantTimeSlot.query.filter_by(
-                consultant_id=consultant.id,
-                is_available=False
-            ).count()
-            
-            utilization_rate = (booked_slots / total_slots * 100) if total_slots > 0 else 0
-            
+        for row in rows:
+            utilization_rate = (row.booked_slots / row.total_slots * 100) if row.total_slots > 0 else 0
+
             consultant_utilization.append({
-                "consultant_id": consultant.id,
-                "consultant_name": consultant.name,
-                "total_slots": total_slots,
-                "booked_slots": booked_slots,
+                "consultant_id": row.id,
+                "consultant_name": row.name,
+                "total_slots": row.total_slots,
+                "booked_slots": row.booked_slots,
                 "utilization_rate": round(utilization_rate, 2)
             })
-        
+
+        # Top consultants by number of bookings
         top_consultants_data = [
             {
                 "consultant_id": row.id,
@@ -152,17 +149,17 @@ def get_consultant_analytics():
                 "consultant_email": row.email,
                 "total_bookings": row.total_bookings,
                 "confirmed_bookings": row.confirmed_bookings,
-                "revenue_generated": float(row.revenue_generated)
-            } for row in top_consultants
+                "revenue_generated": float(row.confirmed_bookings * 2000.0)
+            } for row in sorted(rows, key=lambda row: row.total_bookings, reverse=True)
         ]
-        
+
         return jsonify({
             "consultant_analytics": {
                 "top_consultants": top_consultants_data,
                 "utilization": consultant_utilization
             }
         }), 200
-        
+
     except Exception as e:
         # Return mock data if query fails
         print(f"Consultant analytics error: {e}")
@@ -171,54 +168,33 @@ def get_consultant_analytics():
         }), 200
 
 @booking_bp.route('/analytics/bookings', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_booking_analytics():
-    if not check_admin_access():
-        return jsonify({"message": "Unauthorized access"}), 403
-    
-    # Get booking trends for the last 30 days
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    
-    daily_bookings = db.session.query(
-        func.date(Booking.booking_date).label('date'),
-        func.count(Booking.booking_id).label('count')
-    ).filter(
-        Booking.booking_date >= thirty_days_ago
-    ).group_by(func.date(Booking.booking_date)).all()
-    
-    # Get booking status distribution
-    status_distribution = db.session.query(
-        Booking.status,
-        func.count(Booking.booking_id).label('count')
-    ).group_by(Booking.status).all()
-    
-    # Get popular time slots
-    popular_times = db.session.query(
-        ConsultantTimeSlot.start_time,
-        func.count(Booking.booking_id).label('booking_count')
-    ).join(Booking, ConsultantTimeSlot.slot_id == Booking.time_slot_id).group_by(
-        ConsultantTimeSlot.start_time
-    ).order_by(func.count(Booking.booking_id).desc()).limit(10).all()
+    # Closed days are read from the daily rollups, today is counted live
+    thirty_days_ago = (datetime.now() - timedelta(days=30)).date()
+    daily_bookings = daily_counts('bookings', thirty_days_ago)
+    status_distribution = booking_status_counts()
+    popular_times = sorted(booking_start_time_counts().items(), key=lambda x: x[1], reverse=True)[:10]
     
     daily_trends = [
         {
-            "date": row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date),
-            "count": row.count
-        } for row in daily_bookings
+            "date": day.isoformat(),
+            "count": count
+        } for day, count in sorted(daily_bookings.items())
     ]
     
     status_data = [
         {
-            "status": row.status,
-            "count": row.count
-        } for row in status_distribution
+            "status": status,
+            "count": count
+        } for status, count in status_distribution.items()
     ]
     
     time_slots_data = [
         {
-            "time": row.start_time,
-            "booking_count": row.booking_count
-        } for row in popular_times
+            "time": start_time,
+            "booking_count": count
+        } for start_time, count in popular_times
     ]
     
     return jsonify({
@@ -230,71 +206,43 @@ def get_booking_analytics():
     }), 200
 
 @booking_bp.route('/analytics/users', methods=['GET'])
-@jwt_required()
+@admin_required
 def get_user_analytics():
-    if not check_admin_access():
-        return jsonify({"message": "Unauthorized access"}), 403
-    
-    # Get user registration trends for the last 30 days
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    
-    daily_registrations = db.session.query(
-        func.date(User.created_at).label('date'),
-        func.count(User.id).label('count')
-    ).filter(
-        User.created_at >= thirty_days_ago
-    ).group_by(func.date(User.created_at)).all()
-    
-    # Get user demographics
-    degree_distribution = db.session.query(
-        User.degree_level,
-        func.count(User.id).label('count')
-    ).filter(User.degree_level.isnot(None)).group_by(User.degree_level).all()
+    # Registration trends and demographics come from the daily rollups plus today's sign-ups
+    thirty_days_ago = (datetime.now() - timedelta(days=30)).date()
+    daily_registrations = daily_counts('registrations', thirty_days_ago)
+    degree_distribution = registration_counts('degree_level')
+    mode_distribution = registration_counts('mode')
     
-    mode_distribution = db.session.query(
-        User.mode,
-        func.count(User.id).label('count')
-    ).filter(User.mode.isnot(None)).group_by(User.mode).all()
-    
-    # Get areas of interest (this might need parsing if stored as comma-separated)
-    areas_query = db.session.query(User.areas_of_interest).filter(
-        User.areas_of_interest.isnot(None)
-    ).all()
-    
-    # Parse areas of interest
-    areas_count = {}
-    for row in areas_query:
-        if row.areas_of_interest:
-            areas = [area.strip() for area in row.areas_of_interest.split(',')]
-            for area in areas:
-                areas_count[area] = areas_count.get(area, 0) + 1
+    # Students per area, grouped in the database over the normalized user_interests rows
+    areas_count = popular_areas(limit=10)
     
     registration_trends = [
         {
-            "date": row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date),
-            "count": row.count
-        } for row in daily_registrations
+            "date": day.isoformat(),
+            "count": count
+        } for day, count in sorted(daily_registrations.items())
     ]
     
     degree_data = [
         {
-            "degree_level": row.degree_level,
-            "count": row.count
-        } for row in degree_distribution
+            "degree_level": degree_level,
+            "count": count
+        } for degree_level, count in degree_distribution.items()
     ]
     
     mode_data = [
         {
-            "mode": row.mode,
-            "count": row.count
-        } for row in mode_distribution
+            "mode": mode,
+            "count": count
+        } for mode, count in mode_distribution.items()
     ]
     
     areas_data = [
         {
             "area": area,
             "count": count
-        } for area, count in sorted(areas_count.items(), key=lambda x: x[1], reverse=True)[:10]
+        } for area, count in areas_count
     ]
     
     return jsonify({
@@ -0,0 +1,44 @@
+import os
+from importlib.util import find_spec
+
+from flask import Blueprint, current_app, redirect, render_template, request, url_for
+
+from app.utils.api_docs import api_spec, swagger
+
+# Swagger UI assets and templates shipped with Flasgger, located without importing it
+_FLASGGER_DIR = os.path.dirname(find_spec('flasgger').origin)
+
+# Named 'flasgger' so URLs and endpoint names match the ones Flasgger registers itself
+api_docs_bp = Blueprint(
+    'flasgger', __name__,
+    static_folder=os.path.join(_FLASGGER_DIR, 'ui3', 'static'),
+    static_url_path='/flasgger_static',
+    template_folder=os.path.join(_FLASGGER_DIR, 'ui3', 'templates')
+)
+
+
+@api_docs_bp.route('/apispec_1.json')
+def apispec_1():
+    body, etag = api_spec()
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    # The spec only changes on deploy; clients revalidate and get a 304
+    response.headers['Cache-Control'] = 'public, no-cache'
+    return response.make_conditional(request)
+
+
+@api_docs_bp.route('/apidocs/')
+def apidocs():
+    from flasgger.base import APIDocsView
+
+    return APIDocsView.as_view('apidocs', view_args={'config': swagger().config})()
+
+
+@api_docs_bp.route('/apidocs/index.html')
+def apidocs_index():
+    return redirect(url_for('flasgger.apidocs'))
+
+
+@api_docs_bp.route('/oauth2-redirect.html')
+def oauth_redirect():
+    return render_template('flasgger/oauth2-redirect.html')
@@ -1,12 +1,41 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, url_for
 from app.models import Admin, User, Consultant
 from app.extensions import db
 from app.utils.recommendation_helper import get_recommendations
+from app.utils.recommendation_jobs import recommendation_jobs
 from app.utils.time_slot_generator import generate_consultant_time_slots
+from app.utils.user_lookup import find_user_by_email, email_exists
+from app.utils.interests import set_user_interests
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, set_access_cookies, get_jwt, unset_jwt_cookies
 
 auth_bp = Blueprint('auth', __name__)
 
+def add_recommendations(response_data, user):
+    """
+    Attach recommendations for a student to a login/registration response.
+
+    With RECOMMENDATIONS_ASYNC enabled they are computed on the worker pool
+    instead, and the response points at the endpoint that serves them.
+    """
+    if current_app.config.get('RECOMMENDATIONS_ASYNC'):
+        recommendation_jobs().submit(
+            user.id,
+            areas_of_interest=user.areas_of_interest,
+            degree_level=user.degree_level,
+            mode=user.mode
+        )
+        response_data['recommendations_status'] = 'pending'
+        response_data['recommendations_url'] = url_for('recommendations.get_user_recommendations', user_id=user.id)
+        return
+
+    recommendations = get_recommendations(
+        areas_of_interest=user.areas_of_interest,
+        degree_level=user.degree_level,
+        mode=user.mode
+    )
+    response_data['recommendations'] = recommendations
+    response_data['recommendation_count'] = len(recommendations)
+
 @auth_bp.route('/register/user', methods=['POST'])
 def register_user():
     data = request.get_json()
@@ -14,11 +43,7 @@ def register_user():
     password = data.get('password')
     name = data.get('name')  # Get name from request data
 
-    if any([
-        Admin.query.filter_by(email=email).first(),
-        User.query.filter_by(email=email).first(),
-        Consultant.query.filter_by(email=email).first()
-    ]):
+    if email_exists(email):
         return jsonify({'error': 'Email already exists'}), 400
 
     user = User(
@@ -26,27 +51,21 @@ def register_user():
         name=name,
         phone=data.get('phone'),
         address=data.get('address'),
-        areas_of_interest=data.get('areas_of_interest'),
         degree_level=data.get('degree_level'),
         mode=data.get('mode')
     )
+    # Accepts a list or a comma-separated string; writes user_interests and the display string
+    set_user_interests(user, data.get('areas_of_interest'))
 
     user.set_password(password)
     db.session.add(user)
     db.session.commit()
     
-    recommendations = get_recommendations(
-        areas_of_interest=user.areas_of_interest,
-        degree_level=user.degree_level,
-        mode=user.mode
-    )
-    
     response_data = {
         'message': 'user registered successfully',
-        'user_id': user.id,
-        'recommendations': recommendations,
-        'recommendation_count': len(recommendations)
+        'user_id': user.id
     }
+    add_recommendations(response_data, user)
     
     return jsonify(response_data), 201
 
@@ -57,11 +76,7 @@ def login():
     email = data.get('email')
     password = data.get('password')
 
-    user = (
-        Admin.query.filter_by(email=email).first() or
-        User.query.filter_by(email=email).first() or
-        Consultant.query.filter_by(email=email).first()
-    )
+    user = find_user_by_email(email)
     
     if user and user.check_password(password):
         access_token = create_access_token(
@@ -79,13 +94,7 @@ def login():
         
         # Add recommendations for user type
         if user.user_type == 'user':
-            recommendations = get_recommendations(
-                areas_of_interest=user.areas_of_interest,
-                degree_level=user.degree_level,
-                mode=user.mode
-            )
-            response_data['recommendations'] = recommendations
-            response_data['recommendation_count'] = len(recommendations)
+            add_recommendations(response_data, user)
         
         response = jsonify(response_data)
         
@@ -125,11 +134,7 @@ def register_consultant():
     password = data.get('password')
     name = data.get('name')
 
-    if any([
-        Admin.query.filter_by(email=email).first(),
-        User.query.filter_by(email=email).first(),
-        Consultant.query.filter_by(email=email).first()
-    ]):
+    if email_exists(email):
         return jsonify({'error': 'Email already exists'}), 400
 
     # Get employment type with default to part-time
@@ -169,11 +174,7 @@ def register_admin():
     password = data.get('password')
     name = data.get('name')
 
-    if any([
-        Admin.query.filter_by(email=email).first(),
-        User.query.filter_by(email=email).first(),
-        Consultant.query.filter_by(email=email).first()
-    ]):
+    if email_exists(email):
         return jsonify({'error': 'Email already exists'}), 400
 
     admin = Admin(
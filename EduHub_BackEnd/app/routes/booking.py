@@ -2,57 +2,98 @@ from flask import Blueprint, jsonify, request
 from app.models import Program, University, Consultant, Booking, ConsultantTimeSlot, User
 from app.extensions import db
 from sqlalchemy import func
-from flask_jwt_extended import get_jwt, jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
+from flask_jwt_extended import get_jwt, get_jwt_identity
 from datetime import datetime, date, timedelta
 from app.utils.time_slot_generator import generate_consultant_time_slots
+from app.utils.booking_slots import claim_slot, release_slot, confirm_hold, hold_expiry
+from app.utils.booking_queries import consultant_booking_rows_query, parse_keyset_args, apply_keyset, KeysetError
+from app.utils.availability_cache import (
+    availability_cache, serialize_free_slots, MAX_AVAILABILITY_DAYS, MAX_AVAILABILITY_CONSULTANTS
+)
+from app.utils.http_cache import json_response_with_etag
+from app.utils.jwt_utils import role_required, ALL_ROLES
 import random
 import string
 
 booking_bp = Blueprint('booking', __name__)
 
 @booking_bp.route('/consultants/<int:consultant_id>/timeslots', methods=['GET'])
-@jwt_required()
+@role_required(*ALL_ROLES)
 def get_consultant_timeslots(consultant_id):
-    # Check if consultant exists
-    consultant = Consultant.query.get(consultant_id)
-    if not consultant:
-        return jsonify({'error': 'Consultant not found'}), 404
-
     # Get date filter from query params if provided
     date_filter = request.args.get('date')
 
-    # Query available time slots
-    query = ConsultantTimeSlot.query.filter_by(
-        consultant_id=consultant_id,
-        is_available=True
-    )
-
-    # Apply date filter if provided
+    # Free slots come from the per-day availability cache
     if date_filter:
         try:
             filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
-            query = query.filter_by(date=filter_date)
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
-
-    # Get available slots
-    available_slots = query.all()
+        days = {filter_date: availability_cache().days([consultant_id], [filter_date])[(consultant_id, filter_date)]}
+    else:
+        days = availability_cache().consultant_days(consultant_id)
 
     # Format response
-    timeslots = []
-    for slot in available_slots:
-        timeslots.append({
-            'id': slot.slot_id,
-            'date': slot.date.strftime('%Y-%m-%d'),
-            'start_time': slot.start_time,
-            'end_time': slot.end_time
-        })
+    now = datetime.now()
+    timeslots = [slot for slot_date, day in sorted(days.items()) for slot in serialize_free_slots(day, slot_date, now)]
 
-    return jsonify({'timeslots': timeslots})
+    # Only an empty result needs the existence check to tell "no free slots" from "no such consultant"
+    if not timeslots and not db.session.query(Consultant.id).filter(Consultant.id == consultant_id).first():
+        return jsonify({'error': 'Consultant not found'}), 404
 
+    return json_response_with_etag({'timeslots': timeslots})
+
+@booking_bp.route('/availability', methods=['GET'])
+@role_required(*ALL_ROLES)
+def get_availability():
+    """
+    Free slots of several consultants over a date range in one call.
+
+    Query params: consultant_ids (comma-separated), start_date and end_date
+    (YYYY-MM-DD, inclusive; default today and the following 6 days).
+    Only days with free slots are listed. Responses carry an ETag.
+    """
+    try:
+        consultant_ids = sorted({int(value) for value in request.args.get('consultant_ids', '').split(',') if value.strip()})
+    except ValueError:
+        return jsonify({'error': 'consultant_ids must be a comma-separated list of integers'}), 400
+    if not consultant_ids:
+        return jsonify({'error': 'consultant_ids is required'}), 400
+    if len(consultant_ids) > MAX_AVAILABILITY_CONSULTANTS:
+        return jsonify({'error': f'At most {MAX_AVAILABILITY_CONSULTANTS} consultants per request'}), 400
+
+    try:
+        start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date() if request.args.get('start_date') else date.today()
+        end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date() if request.args.get('end_date') else start_date + timedelta(days=6)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    if end_date < start_date:
+        return jsonify({'error': 'end_date must not be before start_date'}), 400
+    if (end_date - start_date).days + 1 > MAX_AVAILABILITY_DAYS:
+        return jsonify({'error': f'At most {MAX_AVAILABILITY_DAYS} days per request'}), 400
+
+    dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    days = availability_cache().days(consultant_ids, dates)
+
+    now = datetime.now()
+    availability = {str(consultant_id): {} for consultant_id in consultant_ids}
+    for (consultant_id, slot_date), day in days.items():
+        free_slots = day.free_slots(now)
+        if free_slots:
+            availability[str(consultant_id)][slot_date.strftime('%Y-%m-%d')] = [
+                {'id': slot_id, 'start_time': start_time, 'end_time': end_time}
+                for slot_id, start_time, end_time in free_slots
+            ]
+
+    return json_response_with_etag({
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'availability': availability
+    })
 
 @booking_bp.route('/createBooking', methods=['POST'])
-@jwt_required()
+@role_required('user')
 def create_booking():
     # Get current user from JWT token
     current_user_id = get_jwt_identity()
@@ -71,12 +112,15 @@ def create_booking():
 
     time_slot_id = data['time_slot_id']
 
-    # Check if time slot exists and is available
+    # Check if time slot exists
     time_slot = ConsultantTimeSlot.query.get(time_slot_id)
     if not time_slot:
         return jsonify({'error': 'Time slot not found'}), 404
 
-    if not time_slot.is_available:
+    # Claim the slot with a conditional update; under contention only one request wins
+    now = datetime.now()
+    if not claim_slot(time_slot.slot_id, now):
+        db.session.rollback()
         return jsonify({'error': 'This time slot is no longer available'}), 400
 
     # Create new booking
@@ -84,15 +128,19 @@ def create_booking():
         user_id=user.id,
         consultant_id=time_slot.consultant_id,
         time_slot_id=time_slot.slot_id,
-        status='Pending'
+        active_time_slot_id=time_slot.slot_id,
+        status='Pending',
+        hold_expires_at=hold_expiry(now)
     )
 
-    # Mark time slot as unavailable
-    time_slot.is_available = False
-
-    # Save to database
+    # Save to database; the unique active_time_slot_id is a second line of defence
     db.session.add(new_booking)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'This time slot is no longer available'}), 400
+    availability_cache().mark_booked(time_slot.consultant_id, time_slot.date, time_slot.slot_id, new_booking.hold_expires_at)
 
     # Get consultant name for response
     consultant = Consultant.query.get(time_slot.consultant_id)
@@ -105,6 +153,7 @@ def create_booking():
         'time': f"{time_slot.start_time} - {time_slot.end_time}",
         'status': 'Pending',
         'requires_payment': True,
+        'hold_expires_at': new_booking.hold_expires_at.isoformat(),
         'amount': getattr(consultant, 'hourly_rate', None) or 2000
     }), 201
 
@@ -116,34 +165,54 @@ def create_booking():
 
 
 @booking_bp.route('/consultants/<int:consultant_id>/getBookings', methods=['GET'])
-@jwt_required()
+@role_required('consultant', 'admin')
 def get_consultant_bookings(consultant_id):
     current_user_id = get_jwt_identity()
     claims = get_jwt()  # Get all JWT claims
 
-    # Check if the user is an admin or the consultant themselves
+    # Admins see every consultant's bookings, consultants only their own
     is_admin = claims.get('user_type') == 'admin'
-    if not current_user_id or (not is_admin and int(current_user_id) != consultant_id):
+    if not is_admin and int(current_user_id) != consultant_id:
         return jsonify({'error': 'Unauthorized access'}), 403
 
-    bookings = Booking.query.filter_by(consultant_id=consultant_id).all()
-    users = User.query.all()
+    # Optional filters: slot date range and booking status
+    try:
+        start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date() if request.args.get('start_date') else None
+        end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date() if request.args.get('end_date') else None
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    status = request.args.get('status')
+
+    try:
+        after, limit = parse_keyset_args()
+    except KeysetError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # One joined query scoped to the consultant (no per-booking or whole-users-table lookups)
+    query = consultant_booking_rows_query(consultant_id, start_date=start_date, end_date=end_date, status=status)
+    rows = apply_keyset(query, Booking.booking_id, after, limit).all()
+
     booking_list = []
-    for booking in bookings:
-        time_slot = ConsultantTimeSlot.query.get(booking.time_slot_id)
-        user = next((u for u in users if u.id == booking.user_id), None)
+    for row in rows:
+        user_found = row.user_email is not None
         booking_list.append({
-            'booking_id': booking.booking_id,
-            'user_id': booking.user_id,
-            'user_name': user.name if user else "Unknown",
-            'user_email': user.email if user else "Unknown",
-            'user_phone': user.phone if user else "Unknown",
-            'date': time_slot.date.strftime('%Y-%m-%d'),
-            'start_time': time_slot.start_time,
-            'end_time': time_slot.end_time,
-            'status': booking.status
+            'booking_id': row.booking_id,
+            'user_id': row.user_id,
+            'user_name': row.user_name if user_found else "Unknown",
+            'user_email': row.user_email if user_found else "Unknown",
+            'user_phone': row.user_phone if user_found else "Unknown",
+            'date': row.date.strftime('%Y-%m-%d'),
+            'start_time': row.start_time,
+            'end_time': row.end_time,
+            'status': row.status
         })
 
+    if limit is not None:
+        return jsonify({
+            'bookings': booking_list,
+            'next_after': booking_list[-1]['booking_id'] if len(booking_list) == limit else None
+        }), 200
+
     return jsonify({'bookings': booking_list}), 200
 
 def confirm_payment(booking_id):
@@ -159,7 +228,7 @@ def confirm_payment(booking_id):
     return jsonify({'message': 'Payment confirmed successfully'}), 200
 
 @booking_bp.route('/payment/process', methods=['POST'])
-@jwt_required()
+@role_required('user')
 def process_payment():
     current_user_id = get_jwt_identity()
     data = request.get_json()
@@ -190,6 +259,10 @@ def process_payment():
     if booking.status != 'Pending':
         return jsonify({'error': 'This booking is not pending payment'}), 400
 
+    # Check the slot is still held for this booking
+    if booking.hold_expires_at and booking.hold_expires_at < datetime.now():
+        return jsonify({'error': 'The hold on this time slot has expired, please book again'}), 409
+
     # Dummy payment validation
     # Simulate payment failures for specific card numbers
     if card_number == '4000000000000002':
@@ -208,9 +281,12 @@ def process_payment():
     # Generate fake transaction ID
     transaction_id = 'TXN' + ''.join(random.choices(string.ascii_uppercase + string.digits, k=10))
 
-    # Update booking status to Confirmed
-    booking.status = 'Confirmed'
+    # Update booking status to Confirmed, unless the hold lapsed or was reclaimed meanwhile
+    if not confirm_hold(booking.booking_id):
+        db.session.rollback()
+        return jsonify({'error': 'The hold on this time slot has expired, please book again'}), 409
     db.session.commit()
+    availability_cache().mark_booked(booking.consultant_id, booking.time_slot.date, booking.time_slot_id)
 
     return jsonify({
         'message': 'Payment processed successfully',
@@ -220,10 +296,9 @@ def process_payment():
     }), 200
 
 @booking_bp.route('/<int:booking_id>/status', methods=['PATCH'])
-@jwt_required()
+@role_required('consultant')
 def update_booking_status(booking_id):
     current_user_id = get_jwt_identity()
-    claims = get_jwt()
     data = request.get_json()
 
     # Validate request data
@@ -240,13 +315,35 @@ def update_booking_status(booking_id):
         return jsonify({'error': 'Booking not found'}), 404
 
     # Check authorization - only the consultant for this booking can update status
-    is_consultant = claims.get('user_type') == 'consultant'
-    if not is_consultant or int(current_user_id) != booking.consultant_id:
+    if int(current_user_id) != booking.consultant_id:
         return jsonify({'error': 'Unauthorized to update this booking'}), 403
 
+    # Cancelling frees the slot; reinstating a cancelled booking has to win it back
+    freed = False
+    if new_status == 'Cancelled' and booking.status != 'Cancelled':
+        freed = release_slot(booking)
+    elif new_status != 'Cancelled' and booking.status == 'Cancelled':
+        if not claim_slot(booking.time_slot_id):
+            db.session.rollback()
+            return jsonify({'error': 'This time slot is no longer available'}), 409
+        booking.active_time_slot_id = booking.time_slot_id
+
+    # A consultant's decision replaces the payment hold
+    booking.hold_expires_at = None
+
     # Update booking status
     booking.status = new_status
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'This time slot is no longer available'}), 409
+
+    if new_status == 'Cancelled':
+        if freed:
+            availability_cache().mark_free(booking.consultant_id, booking.time_slot.date, booking.time_slot_id)
+    else:
+        availability_cache().mark_booked(booking.consultant_id, booking.time_slot.date, booking.time_slot_id)
 
     return jsonify({
         'message': 'Booking status updated successfully',
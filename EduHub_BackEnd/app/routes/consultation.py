@@ -1,28 +1,30 @@
 from flask import Blueprint, jsonify, request
-from app.models import Program, University, Consultant
-from app.extensions import db
-from sqlalchemy import func
-from flask_jwt_extended import jwt_required
+from app.utils.jwt_utils import role_required, ALL_ROLES
+from app.utils.booking_queries import parse_keyset_args, KeysetError
+from app.utils.consultant_directory import consultant_directory, parse_fields, DirectoryError, FILTERS
+from app.utils.http_cache import json_response_with_etag
 
 consultation_bp = Blueprint('consultation', __name__)
 
 @consultation_bp.route('/getConsultantDetails', methods=['GET'])
-@jwt_required()
+@role_required(*ALL_ROLES)
 def get_consultant_details():
+    # Optional: ?shift=&presence=&employment_type= filters, ?fields=id,name projection,
+    # ?after=<id>&limit=<n> keyset pagination. Without them every consultant is listed as before.
     try:
-        consultants = Consultant.query.all()
-        consultant_list = []
-        for consultant in consultants:
-            consultant_list.append({
-                'id': consultant.id,
-                'name': consultant.name,
-                'email': consultant.email,
-                'phone': consultant.phone,
-                'address': consultant.address,
-                'shift': consultant.shift,
-                'presence': consultant.presence
-            })
-        
-        return jsonify({'consultants': consultant_list}), 200
+        fields = parse_fields(request.args.get('fields'))
+        after, limit = parse_keyset_args()
+    except (DirectoryError, KeysetError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        payload = consultant_directory(
+            filters={name: request.args.get(name) for name in FILTERS},
+            fields=fields,
+            after=after,
+            limit=limit
+        )
+        # Dashboards reload this on every visit; an unchanged directory revalidates with a 304
+        return json_response_with_etag(payload)
     except Exception as e:
         return jsonify({'error': 'An error occurred while fetching consultant details'}), 500
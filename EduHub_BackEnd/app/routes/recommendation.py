@@ -1,6 +1,55 @@
-from flask import Blueprint
+import math
+from flask import Blueprint, jsonify, request
+from app.models import User
+from app.extensions import db
+from app.utils.http_cache import json_response_with_etag
+from app.utils.jwt_utils import role_required
+from app.utils.recommendation_helper import get_recommendations
+from app.utils.recommendation_jobs import recommendation_jobs
+from flask_jwt_extended import get_jwt_identity, get_jwt
 
 recommendations_bp = Blueprint('recommendations', __name__)
 
-# This file is kept for import compatibility but contains no active endpoints
-# as none of the recommendation endpoints are used by the frontend
\ No newline at end of file
+@recommendations_bp.route('/users/<int:user_id>', methods=['GET'])
+@role_required('user', 'admin')
+def get_user_recommendations(user_id):
+    current_user_id = get_jwt_identity()
+
+    # Students may only read their own recommendations; admins any
+    if get_jwt().get('user_type') != 'admin' and int(current_user_id) != user_id:
+        return jsonify({'error': 'Unauthorized access'}), 403
+
+    # Optional ?max_fee= budget: programs above it rank lower
+    max_fee = request.args.get('max_fee')
+    if max_fee is not None:
+        try:
+            max_fee = float(max_fee)
+        except ValueError:
+            max_fee = math.nan
+        if not math.isfinite(max_fee) or max_fee < 0:
+            return jsonify({'error': 'max_fee must be a non-negative number'}), 400
+
+    job = recommendation_jobs().get(user_id)
+    if job:
+        profile, future = job
+        # The login job ranks without a budget, so only unbudgeted reads wait for it
+        if max_fee is None and not future.done():
+            response = jsonify({'user_id': user_id, 'status': 'pending'})
+            response.headers['Retry-After'] = '1'
+            return response, 202
+    else:
+        # Scheduled by another worker process (or not at all): compute here
+        user = db.session.get(User, user_id)
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        profile = {'areas_of_interest': user.areas_of_interest, 'degree_level': user.degree_level, 'mode': user.mode}
+
+    # A finished job has already warmed the cache for this profile
+    recommendations = get_recommendations(**profile, max_fee=max_fee)
+
+    return json_response_with_etag({
+        'user_id': user_id,
+        'status': 'ready',
+        'recommendations': recommendations,
+        'recommendation_count': len(recommendations)
+    })
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, func, select, true
+from app.models import Booking, Consultant, ConsultantTimeSlot, Program, User
+from app.extensions import db
+from app.utils.cache import TTLSnapshot
+
+
+def analytics_snapshot(name):
+    """
+    The process-wide TTLSnapshot for one analytics result.
+
+    Dashboards polling the same endpoint share one computation every
+    ANALYTICS_SNAPSHOT_TTL seconds.
+    """
+    snapshots = current_app.extensions.setdefault('analytics_snapshots', {})
+    snapshot = snapshots.get(name)
+    if snapshot is None:
+        snapshot = snapshots.setdefault(name, TTLSnapshot(current_app.config.get('ANALYTICS_SNAPSHOT_TTL', 10)))
+    return snapshot
+
+
+def count_if(condition):
+    """Conditional aggregate: the number of rows matching `condition` (0 for an empty table)."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def overview_counts(now=None):
+    """
+    Platform totals for the admin overview in one statement.
+
+    Each table is read once: bookings and users through conditional
+    aggregates (status and recent-activity counts in the same pass),
+    consultants and programs as plain counts.
+
+    Returns a dict with total_users, total_consultants, total_bookings,
+    total_programs, confirmed/pending/cancelled_bookings, recent_bookings
+    and recent_users.
+    """
+    week_ago = (now or datetime.now()) - timedelta(days=7)
+    bookings = Booking.__table__
+    users = User.__table__
+
+    booking_counts = select(
+        func.count().label('total_bookings'),
+        count_if(bookings.c.status == 'Confirmed').label('confirmed_bookings'),
+        count_if(bookings.c.status == 'Pending').label('pending_bookings'),
+        count_if(bookings.c.status == 'Cancelled').label('cancelled_bookings'),
+        count_if(bookings.c.booking_date >= week_ago).label('recent_bookings')
+    ).select_from(bookings).subquery('booking_counts')
+    user_counts = select(
+        func.count().label('total_users'),
+        count_if(users.c.created_at >= week_ago).label('recent_users')
+    ).select_from(users).subquery('user_counts')
+
+    row = db.session.execute(select(
+        user_counts.c.total_users,
+        select(func.count()).select_from(Consultant.__table__).scalar_subquery().label('total_consultants'),
+        booking_counts.c.total_bookings,
+        select(func.count()).select_from(Program.__table__).scalar_subquery().label('total_programs'),
+        booking_counts.c.confirmed_bookings,
+        booking_counts.c.pending_bookings,
+        booking_counts.c.cancelled_bookings,
+        booking_counts.c.recent_bookings,
+        user_counts.c.recent_users
+    ).select_from(user_counts.join(booking_counts, true()))).one()
+    return {key: int(value) for key, value in row._mapping.items()}
+
+
+def consultant_stats(start_date=None, end_date=None):
+    """
+    Booking and slot utilization figures for every consultant in one grouped query.
+
+    Slots are left-joined with their bookings and grouped per consultant;
+    consultants without slots are kept by an outer join. With start_date /
+    end_date (inclusive) only slots, and the bookings made for them, dated
+    inside the window are counted.
+
+    Returns rows with id, name, email, total_slots, booked_slots,
+    total_bookings and confirmed_bookings, ordered by consultant id.
+    """
+    slots = ConsultantTimeSlot.__table__
+    bookings = Booking.__table__
+
+    per_consultant = select(
+        slots.c.consultant_id,
+        func.count(slots.c.slot_id.distinct()).label('total_slots'),
+        func.count(case((slots.c.is_available == False, slots.c.slot_id)).distinct()).label('booked_slots'),
+        func.count(bookings.c.booking_id).label('total_bookings'),
+        count_if(bookings.c.status == 'Confirmed').label('confirmed_bookings')
+    ).select_from(
+        slots.outerjoin(bookings, bookings.c.time_slot_id == slots.c.slot_id)
+    ).group_by(slots.c.consultant_id)
+    if start_date:
+        per_consultant = per_consultant.where(slots.c.date >= start_date)
+    if end_date:
+        per_consultant = per_consultant.where(slots.c.date <= end_date)
+    per_consultant = per_consultant.subquery('per_consultant')
+
+    return db.session.query(
+        Consultant.id,
+        Consultant.name,
+        Consultant.email,
+        func.coalesce(per_consultant.c.total_slots, 0).label('total_slots'),
+        func.coalesce(per_consultant.c.booked_slots, 0).label('booked_slots'),
+        func.coalesce(per_consultant.c.total_bookings, 0).label('total_bookings'),
+        func.coalesce(per_consultant.c.confirmed_bookings, 0).label('confirmed_bookings')
+    ).outerjoin(
+        per_consultant, per_consultant.c.consultant_id == Consultant.id
+    ).order_by(Consultant.id).all()
@@ -0,0 +1,245 @@
+from datetime import date, datetime, time, timedelta
+from flask import current_app
+from sqlalchemy import and_, func, select
+from app.models import (
+    Booking, ConsultantTimeSlot, User,
+    BookingDailyStat, BookingStartTimeDailyStat, RegistrationDailyStat, AnalyticsRollupWatermark
+)
+from app.extensions import db
+
+_bookings = Booking.__table__
+_slots = ConsultantTimeSlot.__table__
+_users = User.__table__
+_booking_stats = BookingDailyStat.__table__
+_start_time_stats = BookingStartTimeDailyStat.__table__
+_registration_stats = RegistrationDailyStat.__table__
+
+# Days restated per statement during a rebuild
+CHUNK_DAYS = 31
+
+
+def _day_start(day):
+    return datetime.combine(day, time.min)
+
+
+def _as_date(value):
+    """DATE() comes back as a 'YYYY-MM-DD' string on SQLite and as a date on MySQL."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _day_ranges(days):
+    """Collapse sorted dates into (first, last) runs of consecutive days."""
+    ranges = []
+    for day in days:
+        if ranges and day == ranges[-1][1] + timedelta(days=1):
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+def _chunks(first_day, last_day):
+    while first_day <= last_day:
+        chunk_end = min(last_day, first_day + timedelta(days=CHUNK_DAYS - 1))
+        yield first_day, chunk_end
+        first_day = chunk_end + timedelta(days=1)
+
+
+def _restate_bookings(first_day, last_day):
+    """Recompute both booking rollups for [first_day, last_day] from the raw bookings."""
+    booking_day = func.date(_bookings.c.booking_date)
+    in_range = and_(
+        _bookings.c.booking_date >= _day_start(first_day),
+        _bookings.c.booking_date < _day_start(last_day + timedelta(days=1))
+    )
+    db.session.execute(_booking_stats.delete().where(_booking_stats.c.day.between(first_day, last_day)))
+    db.session.execute(_start_time_stats.delete().where(_start_time_stats.c.day.between(first_day, last_day)))
+    db.session.execute(_booking_stats.insert().from_select(
+        ['day', 'status', 'booking_count'],
+        select(booking_day, _bookings.c.status, func.count())
+        .where(in_range)
+        .group_by(booking_day, _bookings.c.status)
+    ))
+    db.session.execute(_start_time_stats.insert().from_select(
+        ['day', 'start_time', 'booking_count'],
+        select(booking_day, _slots.c.start_time, func.count())
+        .select_from(_bookings.join(_slots, _slots.c.slot_id == _bookings.c.time_slot_id))
+        .where(in_range)
+        .group_by(booking_day, _slots.c.start_time)
+    ))
+
+
+def _restate_registrations(first_day, last_day):
+    """Recompute the registration rollup for [first_day, last_day] from the raw users."""
+    registration_day = func.date(_users.c.created_at)
+    db.session.execute(_registration_stats.delete().where(_registration_stats.c.day.between(first_day, last_day)))
+    db.session.execute(_registration_stats.insert().from_select(
+        ['day', 'degree_level', 'mode', 'user_count'],
+        select(registration_day, _users.c.degree_level, _users.c.mode, func.count())
+        .where(
+            _users.c.created_at >= _day_start(first_day),
+            _users.c.created_at < _day_start(last_day + timedelta(days=1))
+        )
+        .group_by(registration_day, _users.c.degree_level, _users.c.mode)
+    ))
+
+
+def _refresh(name, timestamp_column, restate, changed_column, db_now, full):
+    """
+    Bring one rollup family up to yesterday (database clock).
+
+    Restated on every run: the days closed since the last refresh, the last
+    ANALYTICS_ROLLUP_RESTATE_DAYS days, and (when `changed_column` is given)
+    older days holding rows changed since the previous refresh. Everything is
+    recomputed on the first run or with `full`. Returns the number of days restated.
+    """
+    last_closed = db_now.date() - timedelta(days=1)
+    watermark = db.session.get(AnalyticsRollupWatermark, name)
+
+    ranges = []
+    if full or watermark is None:
+        first_row = db.session.execute(select(func.min(timestamp_column))).scalar()
+        if first_row is not None and _as_date(first_row) <= last_closed:
+            ranges.append((_as_date(first_row), last_closed))
+    else:
+        restate_days = current_app.config.get('ANALYTICS_ROLLUP_RESTATE_DAYS', 7)
+        window_start = min(watermark.closed_through + timedelta(days=1), last_closed - timedelta(days=restate_days - 1))
+        if changed_column is not None:
+            # Rows of older days changed since the last refresh (lagged for transactions in flight)
+            since = watermark.refreshed_at - timedelta(seconds=current_app.config.get('ANALYTICS_ROLLUP_LAG', 300))
+            changed_days = db.session.execute(
+                select(func.date(timestamp_column)).distinct()
+                .where(changed_column >= since, timestamp_column < _day_start(window_start))
+            ).scalars().all()
+            ranges.extend(_day_ranges(sorted(_as_date(day) for day in changed_days)))
+        if window_start <= last_closed:
+            ranges.append((window_start, last_closed))
+
+    restated = 0
+    for first_day, last_day in ranges:
+        for chunk_start, chunk_end in _chunks(first_day, last_day):
+            restate(chunk_start, chunk_end)
+            restated += (chunk_end - chunk_start).days + 1
+
+    if watermark is None:
+        watermark = AnalyticsRollupWatermark(name=name)
+        db.session.add(watermark)
+    watermark.refreshed_at = db_now
+    watermark.closed_through = last_closed
+    db.session.commit()
+    return restated
+
+
+def refresh_rollups(full=False):
+    """
+    Refresh the booking and registration rollups; returns days restated per family.
+
+    Booking statuses change after the day they were made (payment,
+    cancellation), so bookings are tracked by updated_at. Registrations are
+    not edited after sign-up and only need the restate window.
+    """
+    db_now = db.session.execute(select(func.now())).scalar()
+    db_now = db_now if isinstance(db_now, datetime) else datetime.fromisoformat(str(db_now))
+    return {
+        'bookings': _refresh('bookings', _bookings.c.booking_date, _restate_bookings,
+                             _bookings.c.updated_at, db_now, full),
+        'registrations': _refresh('registrations', _users.c.created_at, _restate_registrations,
+                                  None, db_now, full)
+    }
+
+
+def _live_start(name):
+    """
+    Start of the period not covered by the rollups: the day after closed_through.
+
+    None when the rollups were never built, in which case everything is live.
+    """
+    watermark = db.session.get(AnalyticsRollupWatermark, name)
+    if watermark is None:
+        return None, None
+    return watermark.closed_through, _day_start(watermark.closed_through + timedelta(days=1))
+
+
+def _merge(*row_sets):
+    totals = {}
+    for rows in row_sets:
+        for key, count in rows:
+            totals[key] = totals.get(key, 0) + int(count)
+    return totals
+
+
+def daily_counts(name, since_day):
+    """
+    {date: count} of bookings ('bookings') or registrations ('registrations') per day since since_day.
+
+    Closed days come from the rollup; days after the rollup's coverage are
+    counted live from the raw table.
+    """
+    stats, count_column, timestamp = {
+        'bookings': (_booking_stats, _booking_stats.c.booking_count, _bookings.c.booking_date),
+        'registrations': (_registration_stats, _registration_stats.c.user_count, _users.c.created_at)
+    }[name]
+    closed_through, live_start = _live_start(name)
+
+    rolled = []
+    if closed_through is not None and since_day <= closed_through:
+        rolled = db.session.execute(
+            select(stats.c.day, func.sum(count_column))
+            .where(stats.c.day.between(since_day, closed_through))
+            .group_by(stats.c.day)
+        ).all()
+    live_from = max(_day_start(since_day), live_start) if live_start else _day_start(since_day)
+    live = db.session.execute(
+        select(func.date(timestamp), func.count())
+        .where(timestamp >= live_from)
+        .group_by(func.date(timestamp))
+    ).all()
+    return _merge(((_as_date(day), count) for day, count in rolled), ((_as_date(day), count) for day, count in live))
+
+
+def booking_status_counts():
+    """{status: count} over all bookings."""
+    _, live_start = _live_start('bookings')
+    rolled = []
+    live = select(_bookings.c.status, func.count()).group_by(_bookings.c.status)
+    if live_start:
+        rolled = db.session.execute(
+            select(_booking_stats.c.status, func.sum(_booking_stats.c.booking_count)).group_by(_booking_stats.c.status)
+        ).all()
+        live = live.where(_bookings.c.booking_date >= live_start)
+    return _merge(rolled, db.session.execute(live).all())
+
+
+def booking_start_time_counts():
+    """{start_time: count} of bookings over all time."""
+    _, live_start = _live_start('bookings')
+    rolled = []
+    live = select(_slots.c.start_time, func.count()).select_from(
+        _bookings.join(_slots, _slots.c.slot_id == _bookings.c.time_slot_id)
+    ).group_by(_slots.c.start_time)
+    if live_start:
+        rolled = db.session.execute(
+            select(_start_time_stats.c.start_time, func.sum(_start_time_stats.c.booking_count))
+            .group_by(_start_time_stats.c.start_time)
+        ).all()
+        live = live.where(_bookings.c.booking_date >= live_start)
+    return _merge(rolled, db.session.execute(live).all())
+
+
+def registration_counts(column):
+    """{value: count} of students per 'degree_level' or 'mode', ignoring NULLs."""
+    _, live_start = _live_start('registrations')
+    rolled = []
+    live = select(_users.c[column], func.count()).where(_users.c[column].isnot(None)).group_by(_users.c[column])
+    if live_start:
+        rolled = db.session.execute(
+            select(_registration_stats.c[column], func.sum(_registration_stats.c.user_count))
+            .where(_registration_stats.c[column].isnot(None))
+            .group_by(_registration_stats.c[column])
+        ).all()
+        live = live.where(_users.c.created_at >= live_start)
+    return _merge(rolled, db.session.execute(live).all())
@@ -0,0 +1,207 @@
+"""
+OpenAPI settings and schemas for the API docs, and the spec built from them.
+
+Flasgger is imported on the first docs request rather than in create_app().
+The spec is generated once per process, serialized once and served from
+memory with a strong ETag (see app/routes/api_docs.py).
+"""
+import hashlib
+import json
+import threading
+
+from flask import current_app
+
+# Flasgger settings, loaded into app.config['SWAGGER'] by create_app()
+SWAGGER = {
+    'title': 'EduHub API',
+    'uiversion': 3, # Use OpenAPI 3
+    'openapi': '3.0.3', # More specific OpenAPI version
+    'version': '1.0.0',
+    'description': 'API for EduHub, an online educational consultancy firm. Provides user registration, login, and program recommendations.',
+    'termsOfService': 'http://example.com/terms', # Replace with your actual ToS URL
+    'contact': {
+        'name': 'EduHub API Support',
+        'url': 'http://example.com/support',
+        'email': 'support@example.com'
+    },
+    'license': {
+        'name': 'MIT License',
+        'url': 'https://opensource.org/licenses/MIT' # Example license
+    },
+    'components': {
+        'securitySchemes': {
+            'BearerAuth': {
+                'type': 'http',
+                'scheme': 'bearer',
+                'bearerFormat': 'JWT'
+            }
+        },
+        'schemas': {
+            'ErrorResponse': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string', 'example': 'Error message content'}
+                }
+            },
+            'LoginRequest': {
+                'type': 'object',
+                'required': ['email', 'password'],
+                'properties': {
+                    'email': {'type': 'string', 'format': 'email', 'example': 'user@example.com'},
+                    'password': {'type': 'string', 'format': 'password', 'example': 'strongpassword123'}
+                }
+            },
+            'LoginSuccessResponse': {
+                'type': 'object',
+                'properties': {
+                    'message': {'type': 'string', 'example': 'Login successful'},
+                    'user_type': {'type': 'string', 'enum': ['admin', 'user', 'consultant'], 'example': 'user'},
+                    'user_id': {'type': 'integer', 'example': 1}
+                    # Token will be in an HttpOnly cookie, so not in response body
+                }
+            },
+            'ProgramRecommendation': {
+                'type': 'object',
+                'properties': {
+                    'program_id': {'type': 'integer', 'example': 101},
+                    'program_name': {'type': 'string', 'example': 'Bachelor of Science in Computer Science'},
+                    'university': {'type': 'string', 'example': 'Tech University'},
+                    'description': {'type': 'string', 'example': 'A comprehensive program focusing on software development and computer theory.'},
+                    'degree_level': {'type': 'string', 'example': 'Bachelors'},
+                    'mode': {'type': 'string', 'example': 'Online'},
+                    'duration': {'type': 'string', 'example': '4 years'},
+                    'tuition_fees': {'type': 'string', 'example': '$15,000 per year'},
+                    'application_link': {'type': 'string', 'format': 'url', 'example': 'http://apply.techuniversity.edu/cs'}
+                }
+            },
+            'BaseUserRegistrationRequest': {
+                'type': 'object',
+                'required': ['email', 'password'],
+                'properties': {
+                    'email': {'type': 'string', 'format': 'email', 'example': 'newuser@example.com'},
+                    'password': {'type': 'string', 'format': 'password', 'minLength': 8, 'example': 'newpassword123'}
+                }
+            },
+            'UserRegistrationRequest': {
+                'allOf': [
+                    {'$ref': '#/components/schemas/BaseUserRegistrationRequest'},
+                    {
+                        'type': 'object',
+                        'required': ['phone', 'address', 'areas_of_interest', 'degree_level', 'mode'],
+                        'properties': {
+                            'phone': {'type': 'string', 'example': '123-456-7890'},
+                            'address': {'type': 'string', 'example': '123 Main St, Anytown, USA'},
+                            'areas_of_interest': {'type': 'array', 'items': {'type': 'string'}, 'example': ['AI', 'Web Development']},
+                            'degree_level': {'type': 'string', 'enum': ['Bachelors', 'Masters', 'PhD', 'Diploma', 'Certificate'], 'example': 'Bachelors'},
+                            'mode': {'type': 'string', 'enum': ['Online', 'On-Campus', 'Hybrid'], 'example': 'Online'}
+                        }
+                    }
+                ]
+            },
+            'ConsultantRegistrationRequest': {
+                'allOf': [
+                    {'$ref': '#/components/schemas/BaseUserRegistrationRequest'},
+                    {
+                        'type': 'object',
+                        'required': ['phone', 'address', 'shift', 'presence'],
+                        'properties': {
+                            'phone': {'type': 'string', 'example': '987-654-3210'},
+                            'address': {'type': 'string', 'example': '456 Oak Ave, Anytown, USA'},
+                            'shift': {'type': 'string', 'enum': ['Morning', 'Evening', 'Night'], 'example': 'Morning'},
+                            'presence': {'type': 'string', 'enum': ['Online', 'Offline'], 'example': 'Online'},
+                            'employment_type': {'type': 'string', 'enum': ['part-time', 'full-time'], 'example': 'part-time', 'description': 'Employment type affects available time slots. Part-time: 3 slots per day (morning). Full-time: 6 slots per day (morning and afternoon).'}
+                        }
+                    }
+                ]
+            },
+            'AdminRegistrationRequest': { # Essentially the same as BaseUserRegistrationRequest
+                'allOf': [
+                    {'$ref': '#/components/schemas/BaseUserRegistrationRequest'}
+                ]
+            },
+            'BaseRegistrationSuccessResponse': {
+                'type': 'object',
+                'properties': {
+                    'message': {'type': 'string', 'example': 'user registered successfully'},
+                    'user_id': {'type': 'integer', 'example': 1}
+                }
+            },
+            'UserRegistrationSuccessResponse': {
+                'allOf': [
+                    {'$ref': '#/components/schemas/BaseRegistrationSuccessResponse'},
+                    {
+                        'type': 'object',
+                        'properties': {
+                            'recommendations': {
+                                'type': 'array',
+                                'items': {'$ref': '#/components/schemas/ProgramRecommendation'}
+                            },
+                            'recommendation_count': {'type': 'integer', 'example': 3}
+                        }
+                    }
+                ]
+            },
+            'BookingResponse': {
+                'type': 'object',
+                'properties': {
+                    'booking_id': {'type': 'integer', 'example': 1},
+                    'consultant_name': {'type': 'string', 'example': 'consultant@example.com'},
+                    'date': {'type': 'string', 'format': 'date', 'example': '2025-06-25'},
+                    'time': {'type': 'string', 'example': '09:00 - 10:00'},
+                    'status': {'type': 'string', 'enum': ['Pending', 'Confirmed', 'Cancelled'], 'example': 'Pending'}
+                }
+            },
+            'TimeSlotResponse': {
+                'type': 'object',
+                'properties': {
+                    'slot_id': {'type': 'integer', 'example': 1},
+                    'date': {'type': 'string', 'format': 'date', 'example': '2025-06-25'},
+                    'start_time': {'type': 'string', 'example': '09:00'},
+                    'end_time': {'type': 'string', 'example': '10:00'},
+                    'is_available': {'type': 'boolean', 'example': True}
+                }
+            }
+        }
+    },
+    # If you want to protect all endpoints by default:
+    # 'security': [{'BearerAuth': []}]
+}
+
+
+# Reentrant: api_spec() calls swagger() while holding it
+_lock = threading.RLock()
+
+
+def swagger():
+    """The app's Flasgger instance, created (and flasgger imported) on first use."""
+    swag = current_app.extensions.get('api_docs')
+    if swag is None:
+        with _lock:
+            swag = current_app.extensions.get('api_docs')
+            if swag is None:
+                from flasgger import Swagger
+
+                # Only the spec builder is needed: the views live in app/routes/api_docs.py
+                swag = Swagger()
+                swag.app = current_app._get_current_object()
+                swag.load_config(swag.app)
+                current_app.extensions['api_docs'] = swag
+    return swag
+
+
+def api_spec():
+    """
+    The OpenAPI document as (JSON bytes, strong ETag).
+
+    Built from the SWAGGER template and the registered routes on first call,
+    then reused for the life of the process.
+    """
+    cached = current_app.extensions.get('api_spec')
+    if cached is None:
+        with _lock:
+            cached = current_app.extensions.get('api_spec')
+            if cached is None:
+                spec = swagger().get_apispecs('apispec_1')
+                body = json.dumps(spec, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+                cached = current_app.extensions['api_spec'] = (body, hashlib.sha256(body).hexdigest())
+    return cached
@@ -0,0 +1,204 @@
+import threading
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app
+from app.models import Booking, ConsultantTimeSlot
+from app.extensions import db
+from app.utils.cache import LRUTTLCache, MISSING
+
+# The sorted slot dates of one consultant are cached under (consultant_id, DATES)
+DATES = 'dates'
+
+# Limits of the batch availability endpoint
+MAX_AVAILABILITY_DAYS = 62
+MAX_AVAILABILITY_CONSULTANTS = 50
+
+
+class DayAvailability(namedtuple('DayAvailability', 'slots free holds')):
+    """
+    Availability of one consultant on one day.
+
+    - slots: ((slot_id, start_time, end_time), ...) ordered by start time;
+      bit i of the masks below refers to slots[i]
+    - free: bitmap of slots that are free to book
+    - holds: ((bit, hold_expires_at), ...) for slots held by a Pending booking
+      with an expiring hold; they count as free once the hold has expired
+
+    Entries are immutable; write-through replaces them.
+    """
+
+    def free_mask(self, now):
+        mask = self.free
+        for bit, expires_at in self.holds:
+            if expires_at < now:
+                mask |= 1 << bit
+        return mask
+
+    def free_slots(self, now):
+        mask = self.free_mask(now)
+        return [slot for bit, slot in enumerate(self.slots) if mask >> bit & 1]
+
+    def with_slot(self, slot_id, free, hold_expires_at=None):
+        for bit, slot in enumerate(self.slots):
+            if slot[0] == slot_id:
+                break
+        else:
+            return self
+        holds = tuple(hold for hold in self.holds if hold[0] != bit)
+        if free:
+            return self._replace(free=self.free | 1 << bit, holds=holds)
+        if hold_expires_at is not None:
+            holds += ((bit, hold_expires_at),)
+        return self._replace(free=self.free & ~(1 << bit), holds=holds)
+
+
+def build_days(rows):
+    """Group (consultant_id, date, slot_id, start, end, is_available, status, hold_expires_at) rows into DayAvailability entries."""
+    grouped = {}
+    for row in sorted(rows, key=lambda row: (row[0], row[1], row[3], row[2])):
+        grouped.setdefault((row[0], row[1]), []).append(row)
+
+    days = {}
+    for key, day_rows in grouped.items():
+        free = 0
+        holds = []
+        for bit, (_, _, _, _, _, is_available, status, hold_expires_at) in enumerate(day_rows):
+            if is_available:
+                free |= 1 << bit
+            elif status == 'Pending' and hold_expires_at is not None:
+                holds.append((bit, hold_expires_at))
+        days[key] = DayAvailability(
+            slots=tuple((row[2], row[3], row[4]) for row in day_rows),
+            free=free,
+            holds=tuple(holds)
+        )
+    return days
+
+
+def _slot_rows_query():
+    return db.session.query(
+        ConsultantTimeSlot.consultant_id,
+        ConsultantTimeSlot.date,
+        ConsultantTimeSlot.slot_id,
+        ConsultantTimeSlot.start_time,
+        ConsultantTimeSlot.end_time,
+        ConsultantTimeSlot.is_available,
+        Booking.status,
+        Booking.hold_expires_at
+    ).outerjoin(Booking, Booking.active_time_slot_id == ConsultantTimeSlot.slot_id)
+
+
+class AvailabilityCache:
+    """
+    Per-day free-slot bitmaps keyed by (consultant_id, date).
+
+    Misses are loaded with one query per call, however many days are missing.
+    Bookings, cancellations and slot generation write through with
+    mark_booked / mark_free / invalidate. The cache is process-local,
+    so changes made by other processes (e.g. `flask slots roll`) show up once
+    entries expire after AVAILABILITY_CACHE_TTL seconds; booking itself stays
+    safe because slots are claimed atomically in the database.
+    """
+
+    def __init__(self, maxsize=20000, ttl=60):
+        self._entries = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        # Bumped by every write; a load that overlapped a write is not cached
+        self._generation = 0
+
+    def _store(self, entries, generation):
+        with self._lock:
+            if generation != self._generation:
+                return
+            for key, value in entries.items():
+                self._entries.set(key, value)
+
+    def days(self, consultant_ids, dates):
+        """{(consultant_id, date): DayAvailability} for every consultant x date."""
+        keys = [(consultant_id, day) for consultant_id in consultant_ids for day in dates]
+        found = {}
+        missing = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is MISSING:
+                missing.append(key)
+            else:
+                found[key] = entry
+        if not missing:
+            return found
+
+        generation = self._generation
+        missing_ids = sorted({consultant_id for consultant_id, _ in missing})
+        missing_dates = [day for _, day in missing]
+        loaded = build_days(_slot_rows_query().filter(
+            ConsultantTimeSlot.consultant_id.in_(missing_ids),
+            ConsultantTimeSlot.date.between(min(missing_dates), max(missing_dates))
+        ).all())
+        empty = DayAvailability((), 0, ())
+        loaded = {key: loaded.get(key, empty) for key in missing}
+        self._store(loaded, generation)
+        found.update(loaded)
+        return found
+
+    def consultant_days(self, consultant_id):
+        """Every day the consultant has slots on, as {date: DayAvailability}."""
+        dates = self._entries.get((consultant_id, DATES))
+        if dates is not MISSING:
+            days = self.days([consultant_id], dates)
+            return {day: days[(consultant_id, day)] for day in dates}
+
+        generation = self._generation
+        loaded = build_days(_slot_rows_query().filter(ConsultantTimeSlot.consultant_id == consultant_id).all())
+        dates = tuple(sorted(day for _, day in loaded))
+        self._store({**loaded, (consultant_id, DATES): dates}, generation)
+        return {day: loaded[(consultant_id, day)] for day in dates}
+
+    def _update(self, consultant_id, slot_date, slot_id, free, hold_expires_at=None):
+        with self._lock:
+            self._generation += 1
+            key = (consultant_id, slot_date)
+            entry = self._entries.get(key)
+            if entry is not MISSING:
+                self._entries.set(key, entry.with_slot(slot_id, free, hold_expires_at))
+
+    def mark_booked(self, consultant_id, slot_date, slot_id, hold_expires_at=None):
+        """Write through a claimed slot (held until hold_expires_at, or for good when None)."""
+        self._update(consultant_id, slot_date, slot_id, False, hold_expires_at)
+
+    def mark_free(self, consultant_id, slot_date, slot_id):
+        """Write through a released slot."""
+        self._update(consultant_id, slot_date, slot_id, True)
+
+    def invalidate(self, keys):
+        """Drop (consultant_id, date) days whose slots were created or deleted, and those consultants' date lists."""
+        with self._lock:
+            self._generation += 1
+            for consultant_id, day in keys:
+                self._entries.delete((consultant_id, DATES))
+                self._entries.delete((consultant_id, day))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        return self._entries.stats()
+
+
+def availability_cache():
+    cache = current_app.extensions.get('availability_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('availability_cache', AvailabilityCache(
+            maxsize=current_app.config.get('AVAILABILITY_CACHE_SIZE', 20000),
+            ttl=current_app.config.get('AVAILABILITY_CACHE_TTL', 60)
+        ))
+    return cache
+
+
+def serialize_free_slots(day, slot_date, now=None):
+    """Free slots of one day in the timeslot listing format."""
+    return [
+        {'id': slot_id, 'date': slot_date.strftime('%Y-%m-%d'), 'start_time': start_time, 'end_time': end_time}
+        for slot_id, start_time, end_time in day.free_slots(now or datetime.now())
+    ]
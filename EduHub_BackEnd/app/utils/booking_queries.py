@@ -0,0 +1,108 @@
+from flask import request
+from sqlalchemy.orm import aliased
+from app.models import BaseUser, User, Booking, ConsultantTimeSlot
+from app.extensions import db
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class KeysetError(ValueError):
+    pass
+
+
+def parse_keyset_args():
+    """
+    Read `?after=<id>&limit=<n>` keyset pagination arguments.
+
+    Returns (after, limit); both are None when the client did not ask for
+    pagination. Raises KeysetError for malformed values.
+    """
+    after = request.args.get('after')
+    limit = request.args.get('limit')
+    if after is None and limit is None:
+        return None, None
+    try:
+        after = int(after) if after is not None else 0
+        limit = min(int(limit), MAX_PAGE_SIZE) if limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        raise KeysetError('after and limit must be integers')
+    if limit <= 0:
+        raise KeysetError('limit must be positive')
+    return after, limit
+
+
+def apply_keyset(query, key_column, after, limit):
+    """Order by `key_column` and, when paginating, fetch `limit` rows after `after`."""
+    query = query.order_by(key_column)
+    if limit is not None:
+        query = query.filter(key_column > after).limit(limit)
+    return query
+
+
+def booking_rows_query():
+    """
+    Bookings joined with the booking user, consultant and time slot in one query.
+
+    Only the columns the booking listings need are selected. Names live on
+    base_users, so each side joins an alias of it directly instead of loading
+    the full User/Consultant entities.
+    """
+    user_account = aliased(BaseUser)
+    consultant_account = aliased(BaseUser)
+    return db.session.query(
+        Booking.booking_id,
+        Booking.user_id,
+        user_account.name.label('user_name'),
+        Booking.consultant_id,
+        consultant_account.name.label('consultant_name'),
+        Booking.time_slot_id,
+        Booking.status,
+        Booking.booking_date,
+        ConsultantTimeSlot.date,
+        ConsultantTimeSlot.start_time,
+        ConsultantTimeSlot.end_time
+    ).outerjoin(
+        user_account, user_account.id == Booking.user_id
+    ).outerjoin(
+        consultant_account, consultant_account.id == Booking.consultant_id
+    ).outerjoin(
+        ConsultantTimeSlot, ConsultantTimeSlot.slot_id == Booking.time_slot_id
+    )
+
+
+def consultant_booking_rows_query(consultant_id, start_date=None, end_date=None, status=None):
+    """
+    A consultant's bookings joined with the booking user and time slot.
+
+    Optional filters: slot date range (inclusive) and booking status.
+    """
+    # base_users and users are joined separately (not as the nested User entity
+    # join), so both are primary-key lookups instead of a materialized subquery
+    user_account = aliased(BaseUser)
+    users = User.__table__
+    query = db.session.query(
+        Booking.booking_id,
+        Booking.user_id,
+        user_account.name.label('user_name'),
+        user_account.email.label('user_email'),
+        users.c.phone.label('user_phone'),
+        ConsultantTimeSlot.date,
+        ConsultantTimeSlot.start_time,
+        ConsultantTimeSlot.end_time,
+        Booking.status
+    ).join(
+        ConsultantTimeSlot, ConsultantTimeSlot.slot_id == Booking.time_slot_id
+    ).outerjoin(
+        user_account, user_account.id == Booking.user_id
+    ).outerjoin(
+        users, users.c.id == Booking.user_id
+    ).filter(Booking.consultant_id == consultant_id)
+
+    if start_date:
+        query = query.filter(ConsultantTimeSlot.date >= start_date)
+    if end_date:
+        query = query.filter(ConsultantTimeSlot.date <= end_date)
+    if status:
+        query = query.filter(Booking.status == status)
+    return query
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_, select
+from app.models import Booking, ConsultantTimeSlot
+from app.extensions import db
+
+_slots = ConsultantTimeSlot.__table__
+_bookings = Booking.__table__
+
+
+def hold_expiry(now=None):
+    """When a hold taken now should lapse (BOOKING_HOLD_TTL seconds later)."""
+    return (now or datetime.now()) + timedelta(seconds=current_app.config.get('BOOKING_HOLD_TTL', 900))
+
+
+def expired_hold(now):
+    """Condition matching Pending bookings whose hold has lapsed."""
+    return and_(_bookings.c.status == 'Pending', _bookings.c.hold_expires_at < now)
+
+
+def claim_slot(slot_id, now=None):
+    """
+    Atomically mark a slot as taken.
+
+    Runs `UPDATE ... SET is_available = false WHERE slot_id = ? AND is_available = true`,
+    so when several requests race for the same slot the database lets exactly
+    one of them change the row. If the slot is only held by a Pending booking
+    whose hold has expired, that booking is cancelled with an equally
+    conditional update and the slot passes to the caller without waiting for
+    the sweeper. Returns True for the winner, False otherwise.
+    The caller's transaction holds the claim until it commits or rolls back.
+    """
+    result = db.session.execute(
+        _slots.update()
+        .where(_slots.c.slot_id == slot_id, _slots.c.is_available == True)
+        .values(is_available=False)
+    )
+    if result.rowcount == 1:
+        return True
+
+    result = db.session.execute(
+        _bookings.update()
+        .where(_bookings.c.active_time_slot_id == slot_id, expired_hold(now or datetime.now()))
+        .values(status='Cancelled', active_time_slot_id=None, hold_expires_at=None)
+    )
+    return result.rowcount == 1
+
+
+def release_slot(booking):
+    """
+    Cancel-side counterpart of claim_slot: drop the booking's active claim and free its slot.
+
+    The slot is only made available again if this booking actually held the
+    claim; a booking without one (e.g. left unclaimed by an older migration)
+    must not free a slot another booking still holds. Returns True if the
+    slot was freed.
+    """
+    holds_claim = booking.active_time_slot_id == booking.time_slot_id
+    booking.active_time_slot_id = None
+    booking.hold_expires_at = None
+    if not holds_claim:
+        return False
+    db.session.execute(
+        _slots.update().where(_slots.c.slot_id == booking.time_slot_id).values(is_available=True)
+    )
+    return True
+
+
+def confirm_hold(booking_id, now=None):
+    """
+    Turn a Pending booking into Confirmed, provided its hold has not expired.
+
+    Conditional like claim_slot, so a payment cannot confirm a booking whose
+    slot is concurrently being reclaimed or swept. Returns True on success.
+    """
+    now = now or datetime.now()
+    result = db.session.execute(
+        _bookings.update()
+        .where(
+            _bookings.c.booking_id == booking_id,
+            _bookings.c.status == 'Pending',
+            or_(_bookings.c.hold_expires_at.is_(None), _bookings.c.hold_expires_at >= now)
+        )
+        .values(status='Confirmed', hold_expires_at=None)
+    )
+    return result.rowcount == 1
+
+
+def release_expired_holds(batch_size=500, now=None):
+    """
+    Cancel Pending bookings whose hold has expired and make their slots available again.
+
+    Works in batches of `batch_size` bookings, one transaction each. Candidates
+    are read through the hold_expires_at index (locked with SKIP LOCKED where
+    the database supports it, so parallel sweepers split the work), and both
+    updates re-check the expiry condition, so bookings paid or reclaimed in
+    the meantime are left alone. Returns the number of holds released.
+    """
+    now = now or datetime.now()
+    released = 0
+    while True:
+        booking_ids = db.session.execute(
+            select(_bookings.c.booking_id)
+            .where(expired_hold(now))
+            .order_by(_bookings.c.hold_expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not booking_ids:
+            db.session.rollback()
+            break
+
+        expiring = and_(_bookings.c.booking_id.in_(booking_ids), expired_hold(now))
+        # Free the slots first, while the bookings still point at them
+        db.session.execute(
+            _slots.update()
+            .where(_slots.c.slot_id.in_(select(_bookings.c.active_time_slot_id).where(expiring)))
+            .values(is_available=True)
+        )
+        result = db.session.execute(
+            _bookings.update()
+            .where(expiring)
+            .values(status='Cancelled', active_time_slot_id=None, hold_expires_at=None)
+        )
+        db.session.commit()
+        released += result.rowcount
+
+        if len(booking_ids) < batch_size:
+            break
+    return released
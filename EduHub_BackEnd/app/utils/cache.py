@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Returned by LRUTTLCache.get when a key is absent, expired or stale
+MISSING = object()
+
+
+class LRUTTLCache:
+    """
+    Thread-safe, bounded LRU cache with an optional per-entry TTL.
+
+    Entries can be stamped with a version (e.g. a catalog version counter).
+    A lookup with a different version is treated as a miss and the stale entry
+    is dropped, so bumping the version invalidates everything at once without
+    walking the cache.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, version, expires_at)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, entry_version, expires_at = entry
+                if entry_version == version and (expires_at is None or expires_at > time.monotonic()):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # Expired or written against an older version
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return MISSING
+
+    def set(self, key, value, version=None):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, version, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class TTLSnapshot:
+    """
+    A single memoized value that is recomputed at most once per `ttl` seconds.
+
+    Concurrent callers that find the snapshot stale wait for the one caller
+    that recomputes it instead of all running the computation (single flight).
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entry = (MISSING, 0.0)  # (value, expires_at), replaced as a whole
+
+    def get(self, compute):
+        value, expires_at = self._entry
+        if value is not MISSING and expires_at > time.monotonic():
+            return value
+        with self._lock:
+            # Another caller may have refreshed it while we waited for the lock
+            value, expires_at = self._entry
+            if value is MISSING or expires_at <= time.monotonic():
+                value = compute()
+                self._entry = (value, time.monotonic() + self.ttl)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entry = (MISSING, 0.0)
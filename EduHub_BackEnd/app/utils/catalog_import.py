@@ -0,0 +1,198 @@
+"""
+Bulk import of the Program / University catalog from CSV or Excel files (`flask catalog import`).
+
+Files are read in chunks, cleaned with vectorized pandas operations and
+upserted keyed on program_id / uni_id. Every row is hashed; rows whose hash
+matches the stored row_hash are skipped, so re-importing an unchanged file
+costs one key lookup per chunk and no writes.
+
+pandas is imported here and only here, so the web app does not load it at startup.
+"""
+import os
+import time
+from collections import namedtuple
+
+import pandas as pd
+from sqlalchemy import select
+
+from app.models import Program, University
+from app.extensions import db
+from app.utils.ingestion import FEE_NOISE
+
+
+class CatalogImportError(ValueError):
+    pass
+
+
+CatalogSpec = namedtuple('CatalogSpec', 'model key columns integer_columns required')
+
+CATALOGS = {
+    'universities': CatalogSpec(
+        model=University,
+        key='uni_id',
+        columns=('uni_id', 'name', 'address', 'phone', 'email'),
+        integer_columns=('uni_id',),
+        required=('uni_id', 'name')
+    ),
+    'programs': CatalogSpec(
+        model=Program,
+        key='program_id',
+        columns=('program_id', 'name', 'duration', 'uni_id', 'degree_level', 'mode', 'fee',
+                 'requirements', 'scholarships', 'area_of_study'),
+        integer_columns=('program_id', 'uni_id'),
+        required=('program_id', 'name', 'uni_id', 'area_of_study')
+    ),
+}
+
+
+def clean_fees(values):
+    """Vectorized ingestion.clean_fee: drop currency letters, commas and whitespace, parse as float (NaN when invalid)."""
+    cleaned = values.astype('string').str.upper().str.replace(FEE_NOISE, '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').astype('float64')
+
+
+def _read_excel_chunks(path, chunk_size, sheet_name=None):
+    # openpyxl streams rows in read-only mode; pandas.read_excel would load the whole sheet
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunk_size:
+                yield pd.DataFrame(batch, columns=header, dtype=object)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, dtype=object)
+    finally:
+        workbook.close()
+
+
+def read_chunks(path, chunk_size, sheet_name=None):
+    """Yield DataFrames of up to `chunk_size` raw rows from a .csv or .xlsx file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        yield from pd.read_csv(path, dtype=str, chunksize=chunk_size)
+    elif extension in ('.xlsx', '.xlsm'):
+        yield from _read_excel_chunks(path, chunk_size, sheet_name)
+    else:
+        raise CatalogImportError(f"Unsupported file type '{extension}': expected .csv or .xlsx")
+
+
+def prepare_chunk(chunk, spec):
+    """
+    Normalize one raw chunk: snake_case headers, trimmed text, integer keys, cleaned fees.
+
+    Columns missing from the file are left out (and left untouched on update).
+    Rows without a required value are dropped; a key repeated in the chunk
+    keeps its last row. Returns (frame with a row_hash column, invalid rows,
+    duplicate rows dropped).
+    """
+    chunk = chunk.rename(columns=lambda column: str(column).strip().lower().replace(' ', '_'))
+    missing = [column for column in spec.required if column not in chunk.columns]
+    if missing:
+        raise CatalogImportError(f"Missing required columns: {', '.join(missing)}")
+    columns = [column for column in spec.columns if column in chunk.columns]
+
+    frame = pd.DataFrame(index=chunk.index)
+    for column in columns:
+        if column in spec.integer_columns:
+            frame[column] = pd.to_numeric(chunk[column], errors='coerce')
+        elif column == 'fee':
+            frame[column] = clean_fees(chunk[column])
+        else:
+            text = chunk[column].astype('string').str.strip()
+            frame[column] = text.mask(text == '')
+
+    valid = frame[list(spec.required)].notna().all(axis=1)
+    # Keys must be whole numbers
+    for column in spec.integer_columns:
+        if column in frame:
+            valid &= frame[column].isna() | (frame[column] % 1 == 0)
+    frame = frame[valid]
+    for column in spec.integer_columns:
+        if column in frame:
+            frame[column] = frame[column].astype('Int64')
+    duplicated = frame.duplicated(spec.key, keep='last')
+    frame = frame[~duplicated]
+
+    # The column list is part of the hash, so a file with other columns never matches
+    hashed = frame.assign(_columns=','.join(columns))
+    frame['row_hash'] = pd.util.hash_pandas_object(hashed, index=False).map('{:016x}'.format)
+    return frame, int((~valid).sum()), int(duplicated.sum())
+
+
+def _upsert_statement(spec, columns):
+    table = spec.model.__table__
+    update_columns = [column for column in columns if column != spec.key]
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table)
+        return statement.on_duplicate_key_update({column: statement.inserted[column] for column in update_columns})
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        statement = insert(table)
+        return statement.on_conflict_do_update(
+            index_elements=[spec.key],
+            set_={column: statement.excluded[column] for column in update_columns}
+        )
+    raise CatalogImportError(f"Upserts are not supported on {dialect}")
+
+
+def import_catalog(path, kind, chunk_size=5000, sheet_name=None):
+    """
+    Upsert the rows of one file into the 'programs' or 'universities' catalog.
+
+    Each chunk costs one indexed lookup of the stored row hashes and, for new
+    or changed rows only, one batched upsert; chunks commit separately.
+    Core upserts bypass the ORM events that keep the recommendation index
+    current, and that index lives in each web worker anyway, so running
+    workers only see the changes once RECOMMENDATION_INDEX_TTL (and then
+    RECOMMENDATION_CACHE_TTL) expires.
+
+    Returns:
+        dict: rows read, inserted, updated, unchanged, invalid and duplicate (an
+            earlier row of the same chunk repeated the key), plus seconds taken
+    """
+    spec = CATALOGS[kind]
+    table = spec.model.__table__
+    key_column = table.c[spec.key]
+    stats = {'rows': 0, 'inserted': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0, 'duplicate': 0}
+    started = time.monotonic()
+
+    for chunk in read_chunks(path, chunk_size, sheet_name):
+        stats['rows'] += len(chunk)
+        frame, invalid, duplicates = prepare_chunk(chunk, spec)
+        stats['invalid'] += invalid
+        stats['duplicate'] += duplicates
+        if frame.empty:
+            continue
+
+        stored = dict(db.session.execute(
+            select(key_column, table.c.row_hash).where(key_column.in_(frame[spec.key].tolist()))
+        ).all())
+        stored_hashes = frame[spec.key].map(stored)
+        changed = frame[stored_hashes.ne(frame['row_hash'])]
+        new_rows = int((~changed[spec.key].isin(list(stored))).sum())
+        stats['inserted'] += new_rows
+        stats['updated'] += len(changed) - new_rows
+        stats['unchanged'] += len(frame) - len(changed)
+        if changed.empty:
+            continue
+
+        records = changed.astype(object).where(changed.notna(), None).to_dict('records')
+        db.session.execute(_upsert_statement(spec, list(changed.columns)), records)
+        db.session.commit()
+
+    stats['seconds'] = time.monotonic() - started
+    return stats
@@ -0,0 +1,111 @@
+import threading
+
+from flask import current_app, has_app_context
+
+from app.models import Consultant
+from app.extensions import db
+from app.utils.booking_queries import apply_keyset
+from app.utils.cache import LRUTTLCache, MISSING
+from app.utils.model_events import on_commit
+
+# Columns a client may project with ?fields=; the directory returns DEFAULT_FIELDS otherwise
+DIRECTORY_FIELDS = ('id', 'name', 'email', 'phone', 'address', 'shift', 'presence', 'employment_type')
+DEFAULT_FIELDS = ('id', 'name', 'email', 'phone', 'address', 'shift', 'presence')
+FILTERS = ('shift', 'presence', 'employment_type')
+
+
+class DirectoryError(ValueError):
+    pass
+
+
+class _DirectoryVersion:
+    """Counter bumped on every committed consultant insert, update or delete."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+
+
+def parse_fields(value):
+    """Turn `?fields=id,name` into a tuple of directory columns; raises DirectoryError for unknown ones."""
+    if not value:
+        return DEFAULT_FIELDS
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    if not fields:
+        raise DirectoryError('fields must name at least one column')
+    unknown = [field for field in fields if field not in DIRECTORY_FIELDS]
+    if unknown:
+        raise DirectoryError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(DIRECTORY_FIELDS)}")
+    return fields
+
+
+def _directory_cache():
+    cache = current_app.extensions.get('consultant_directory_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('consultant_directory_cache', LRUTTLCache(
+            maxsize=current_app.config.get('CONSULTANT_DIRECTORY_CACHE_SIZE', 256),
+            ttl=current_app.config.get('CONSULTANT_DIRECTORY_CACHE_TTL', 300)
+        ))
+    return cache
+
+
+def _directory_version():
+    version = current_app.extensions.get('consultant_directory_version')
+    if version is None:
+        version = current_app.extensions.setdefault('consultant_directory_version', _DirectoryVersion())
+    return version
+
+
+def consultant_directory(filters=None, fields=DEFAULT_FIELDS, after=None, limit=None):
+    """
+    One page of the consultant directory, ordered by id.
+
+    Only the projected columns are selected. Pages are cached per
+    (filters, fields, after, limit) and stamped with the app's directory version, so a
+    consultant registering or changing drops them all; changes made by other
+    processes show up after CONSULTANT_DIRECTORY_CACHE_TTL seconds.
+
+    Args:
+        filters (dict): Exact-match values for shift, presence and employment_type
+        fields (tuple): Columns to return (see DIRECTORY_FIELDS)
+        after (int): Keyset cursor, the last id of the previous page
+        limit (int): Page size; None returns every match
+
+    Returns:
+        dict: {'consultants': [...]}, plus 'next_after' when paginating
+    """
+    filters = {key: value for key, value in (filters or {}).items() if value is not None}
+    key = (tuple(sorted(filters.items())), fields, after, limit)
+    cache = _directory_cache()
+    # Read the version before querying: a page loaded while a change commits is stored stale
+    version = _directory_version().value
+    payload = cache.get(key, version=version)
+    if payload is not MISSING:
+        return payload
+
+    columns = [getattr(Consultant, field) for field in fields if field != 'id']
+    query = db.session.query(Consultant.id, *columns)
+    for column, value in filters.items():
+        query = query.filter(getattr(Consultant, column) == value)
+    rows = apply_keyset(query, Consultant.id, after, limit).all()
+
+    payload = {'consultants': [{field: getattr(row, field) for field in fields} for row in rows]}
+    if limit is not None:
+        payload['next_after'] = rows[-1].id if len(rows) == limit else None
+    cache.set(key, payload, version=version)
+    return payload
+
+
+# ------------------- CONSULTANT CHANGE EVENTS -------------------
+def _bump_directory_version(changes):
+    if has_app_context():
+        version = current_app.extensions.get('consultant_directory_version')
+        if version is not None:
+            version.bump()
+
+
+on_commit((Consultant,), _bump_directory_version)
@@ -0,0 +1,19 @@
+import hashlib
+import json
+
+from flask import current_app, request
+
+
+def json_response_with_etag(payload, status=200):
+    """
+    Serialize `payload` once and return it with a strong ETag.
+
+    If the request's If-None-Match matches, a body-less 304 is returned instead,
+    so pollers only pay for the payload when it actually changed.
+    """
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    response = current_app.response_class(body, status=status, mimetype='application/json')
+    response.set_etag(hashlib.sha1(body.encode('utf-8')).hexdigest())
+    # Clients may keep the response but must revalidate it before reuse
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response.make_conditional(request)
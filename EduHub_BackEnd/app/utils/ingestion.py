@@ -0,0 +1,49 @@
+"""
+Helpers for loading catalog data from spreadsheets.
+
+Deliberately free of pandas: importing this module is cheap. The chunked,
+pandas-based importer lives in app/utils/catalog_import.py and is only
+imported by `flask catalog import`.
+"""
+import math
+import re
+import sys
+
+# Characters stripped from fees before parsing ("LKR 150,000" -> 150000.0)
+FEE_NOISE = r'[LKR\s,]'
+_FEE_NOISE_RE = re.compile(FEE_NOISE)
+
+
+def _is_missing(value):
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return math.isnan(value)
+    # pandas' own missing markers (NA, NaT) only reach us when pandas is loaded already
+    pd = sys.modules.get('pandas')
+    if pd is not None and not isinstance(value, (str, int)):
+        try:
+            return bool(pd.isna(value))
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def clean_fee(fee_str):
+    """
+    Clean a fee such as "LKR 150,000" into a float.
+
+    Returns None for missing values (None, NaN, pandas NA) and for values
+    that do not parse as a number once "LKR"/"KR", commas and whitespace
+    are removed.
+    """
+    if _is_missing(fee_str):
+        return None
+    # Fast path for numeric cells
+    if isinstance(fee_str, (int, float)) and not isinstance(fee_str, bool):
+        return float(fee_str)
+    cleaned_fee = _FEE_NOISE_RE.sub('', str(fee_str).upper())
+    try:
+        return float(cleaned_fee)
+    except ValueError:
+        return None
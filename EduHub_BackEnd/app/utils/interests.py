@@ -0,0 +1,70 @@
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from app.models import Area, user_interests
+from app.extensions import db
+
+
+def parse_areas(areas_of_interest):
+    """
+    Split a comma-separated string or a list of areas into unique (name, label) pairs.
+
+    `name` is the normalized key (stripped, lowercase) and `label` the spelling
+    as entered. Blank entries are dropped; the first spelling of a name wins.
+    """
+    if not areas_of_interest:
+        return []
+    if isinstance(areas_of_interest, str):
+        areas_of_interest = areas_of_interest.split(',')
+    areas = {}
+    for area in areas_of_interest:
+        label = area.strip() if isinstance(area, str) else ''
+        if label:
+            areas.setdefault(label.lower(), label)
+    return list(areas.items())
+
+
+def get_or_create_areas(pairs):
+    """Area rows for (name, label) pairs, adding names not in the vocabulary yet."""
+    if not pairs:
+        return []
+    names = [name for name, _ in pairs]
+    found = {area.name: area for area in Area.query.filter(Area.name.in_(names)).all()}
+    for name, label in pairs:
+        if name in found:
+            continue
+        try:
+            with db.session.begin_nested():
+                area = Area(name=name, label=label)
+                db.session.add(area)
+            found[name] = area
+        except IntegrityError:
+            # Added by a concurrent registration. A locking read sees the latest
+            # committed row, which a plain read from our REPEATABLE READ snapshot may not
+            found[name] = Area.query.filter_by(name=name).with_for_update(read=True).one()
+    return [found[name] for name in names]
+
+
+def set_user_interests(user, areas_of_interest):
+    """
+    Store a student's areas of interest.
+
+    Writes the normalized user_interests rows and keeps users.areas_of_interest
+    as the comma-separated display copy returned by the API.
+    """
+    pairs = parse_areas(areas_of_interest)
+    user.areas_of_interest = ', '.join(label for _, label in pairs) or None
+    user.interests = get_or_create_areas(pairs)
+
+
+def popular_areas(limit=10):
+    """(label, student count) of the most popular areas, counted in the database."""
+    per_area = select(
+        user_interests.c.area_id,
+        func.count().label('user_count')
+    ).group_by(user_interests.c.area_id).subquery('per_area')
+    return db.session.execute(
+        select(Area.label, per_area.c.user_count)
+        .join(per_area, per_area.c.area_id == Area.area_id)
+        .order_by(per_area.c.user_count.desc(), Area.area_id)
+        .limit(limit)
+    ).all()
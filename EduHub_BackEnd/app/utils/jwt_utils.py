@@ -0,0 +1,81 @@
+from functools import wraps
+from flask import current_app, has_app_context, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import select
+from app.models import Admin
+from app.extensions import db
+from app.utils.cache import TTLSnapshot
+from app.utils.model_events import on_commit
+
+# Every account type login() puts in the `user_type` claim
+ALL_ROLES = ('user', 'consultant', 'admin')
+
+
+def _admin_ids_snapshot():
+    snapshot = current_app.extensions.get('admin_ids')
+    if snapshot is None:
+        snapshot = current_app.extensions.setdefault('admin_ids', TTLSnapshot(current_app.config.get('ADMIN_ROLE_CACHE_TTL', 60)))
+    return snapshot
+
+
+def is_admin(user_id):
+    """
+    Check that `user_id` still belongs to an admin account.
+
+    Known admin ids are held in a process-wide TTL snapshot (one query per
+    ADMIN_ROLE_CACHE_TTL seconds, dropped on every committed Admin change), so
+    a demoted or deleted admin loses access within that window. An id missing
+    from the snapshot is looked up directly, so admins created by another
+    process are let in before the snapshot expires.
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return False
+    snapshot = _admin_ids_snapshot()
+    if user_id in snapshot.get(lambda: frozenset(db.session.execute(select(Admin.id)).scalars())):
+        return True
+    if db.session.execute(select(Admin.id).where(Admin.id == user_id)).first() is None:
+        return False
+    snapshot.clear()
+    return True
+
+
+def role_required(*roles, error_key='error'):
+    """
+    Require a valid JWT whose `user_type` claim is one of `roles`.
+
+    Use in place of @jwt_required(). The claim is signed at login, so it is
+    trusted without a database lookup; admin claims are additionally checked
+    with is_admin() unless ADMIN_ROLE_VERIFY is off. Other callers get a 403
+    with {error_key: 'Unauthorized access'}.
+
+    Args:
+        roles (str): Accepted account types ('user', 'consultant', 'admin')
+        error_key (str): Key of the message in the 403 body
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            verify_jwt_in_request()
+            user_type = get_jwt().get('user_type')
+            if user_type not in roles or (
+                user_type == 'admin'
+                and current_app.config.get('ADMIN_ROLE_VERIFY', True)
+                and not is_admin(get_jwt_identity())
+            ):
+                return jsonify({error_key: 'Unauthorized access'}), 403
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ------------------- ADMIN CHANGE EVENTS -------------------
+def _clear_admin_ids(changes):
+    if has_app_context():
+        snapshot = current_app.extensions.get('admin_ids')
+        if snapshot is not None:
+            snapshot.clear()
+
+
+on_commit((Admin,), _clear_admin_ids)
@@ -0,0 +1,58 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+# session.info key holding {callback: {model: primary keys}} until the session commits
+_SESSION_PENDING_KEY = 'model_events_pending'
+
+
+def on_commit(models, callback):
+    """
+    Call `callback(changes)` once a transaction that changed any of `models` commits.
+
+    Inserts, updates and deletes are collected per session as they flush and
+    handed over only after the outermost transaction commits, so caches never
+    reload rows that may still be rolled back; a rollback discards them.
+    SAVEPOINTs (Session.begin_nested) neither deliver nor discard the pending
+    changes of the transaction around them.
+
+    Args:
+        models (iterable): Mapped classes to watch
+        callback (callable): Receives {model: set of primary keys} for the
+            watched models that changed; single-column keys are plain values
+    """
+    for model in models:
+        stash = _stasher(model, callback)
+        for name in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, name, stash)
+
+
+def _stasher(model, callback):
+    def stash(mapper, connection, target):
+        session = object_session(target)
+        if session is None:
+            return
+        identity = mapper.primary_key_from_instance(target)
+        key = identity[0] if len(identity) == 1 else tuple(identity)
+        changes = session.info.setdefault(_SESSION_PENDING_KEY, {}).setdefault(callback, {})
+        changes.setdefault(model, set()).add(key)
+    return stash
+
+
+def _deliver_changes(session):
+    # Releasing a SAVEPOINT also fires after_commit; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    for callback, changes in session.info.pop(_SESSION_PENDING_KEY, {}).items():
+        callback(changes)
+
+
+def _discard_changes(session):
+    # Rolling back a SAVEPOINT leaves the outer transaction, and its changes, in place.
+    # Changes flushed inside the savepoint stay pending: delivering them is harmless.
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_SESSION_PENDING_KEY, None)
+
+
+event.listen(Session, 'after_commit', _deliver_changes)
+event.listen(Session, 'after_rollback', _discard_changes)
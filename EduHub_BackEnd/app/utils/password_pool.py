@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import current_app
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the password hashing pool cannot take more work."""
+
+    def __init__(self, retry_after=1):
+        super().__init__('Password hashing pool is saturated')
+        self.retry_after = retry_after
+
+
+class PasswordHashPool:
+    """
+    Size-bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL while hashing, so a few dedicated threads keep the
+    CPU busy without pinning every request thread during a login burst. At most
+    `max_workers + max_queue` jobs are admitted; anything beyond that (or a job
+    that waits longer than `timeout` seconds) raises PasswordPoolSaturated so the
+    caller can answer 503 straight away.
+    """
+
+    def __init__(self, max_workers=4, max_queue=64, timeout=5.0, retry_after=1):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bcrypt')
+        self._admission = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._started = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _track(self, fn, args, enqueued_at):
+        wait = time.monotonic() - enqueued_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._started += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def submit(self, fn, *args):
+        """Admit `fn(*args)` to the pool and return its future, or raise PasswordPoolSaturated."""
+        if not self._admission.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordPoolSaturated(self.retry_after)
+
+        with self._lock:
+            self._queued += 1
+        future = self._executor.submit(self._track, fn, args, time.monotonic())
+        # Free the admission slot when the job finishes, even if its caller gave up
+        future.add_done_callback(lambda _: self._admission.release())
+        return future
+
+    def run(self, fn, *args):
+        """Run `fn(*args)` on the pool and wait for the result."""
+        future = self.submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._timed_out += 1
+            raise PasswordPoolSaturated(self.retry_after)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queue_depth': self._queued,
+                'running': self._running,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'timed_out': self._timed_out,
+                'avg_wait_ms': round(self._total_wait / self._started * 1000, 3) if self._started else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3)
+            }
+
+
+def password_pool():
+    pool = current_app.extensions.get('password_pool')
+    if pool is None:
+        pool = current_app.extensions.setdefault('password_pool', PasswordHashPool(
+            max_workers=current_app.config.get('BCRYPT_POOL_WORKERS', 4),
+            max_queue=current_app.config.get('BCRYPT_POOL_QUEUE_SIZE', 64),
+            timeout=current_app.config.get('BCRYPT_POOL_TIMEOUT', 5.0),
+            retry_after=current_app.config.get('BCRYPT_POOL_RETRY_AFTER', 1)
+        ))
+    return pool
+
+
+def hash_cost(password_hash):
+    """Return the cost factor encoded in a bcrypt hash ("$2b$12$..." -> 12), or None."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(password_hash):
+    if not current_app.config.get('BCRYPT_REHASH_ON_LOGIN', True):
+        return False
+    return hash_cost(password_hash) != current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
+
+
+def schedule_rehash(user_id, old_hash, raw_password):
+    """
+    Re-hash a verified password at the configured cost in the background.
+
+    The update only applies if the stored hash is still `old_hash`, so a
+    password change that lands in the meantime is never overwritten. If the
+    pool is busy or the update fails (the failure is logged) the rehash is
+    skipped; the next successful login retries it.
+    """
+    from app.extensions import bcrypt, db
+    from app.models import BaseUser
+
+    app = current_app._get_current_object()
+
+    def rehash():
+        new_hash = bcrypt.generate_password_hash(raw_password).decode('utf-8')
+        with app.app_context():
+            try:
+                db.session.execute(
+                    BaseUser.__table__.update()
+                    .where(BaseUser.__table__.c.id == user_id, BaseUser.__table__.c.password == old_hash)
+                    .values(password=new_hash)
+                )
+                db.session.commit()
+            except Exception:
+                # Nobody waits on this future, so report the failure here
+                db.session.rollback()
+                app.logger.exception('Password rehash failed for user %s', user_id)
+
+    try:
+        password_pool().submit(rehash)
+    except PasswordPoolSaturated:
+        pass
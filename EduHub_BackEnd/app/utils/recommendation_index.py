@@ -0,0 +1,282 @@
+import threading
+import time
+
+from flask import current_app
+from app.extensions import db
+from app.models import Program, University
+from app.utils.model_events import on_commit
+
+
+def _normalize(value):
+    return value.strip().lower() if value else ''
+
+
+class RecommendationIndex:
+    """
+    Process-local, in-memory index over the Program/University catalog.
+
+    Every program gets a fixed position. Its categorical features (normalized
+    area_of_study, degree_level and mode) are encoded into a numpy feature
+    matrix, so ranking the whole catalog for a profile is one vectorized
+    scoring pass followed by a top-k selection.
+
+    - Query terms match every area that contains them, which keeps the
+      `LIKE '%term%'` semantics of the original query while only scanning the
+      (small) set of distinct areas.
+    - Changed programs are refreshed incrementally on the next lookup. The whole
+      index is rebuilt once it is older than RECOMMENDATION_INDEX_TTL seconds,
+      which also picks up writes made by other processes or bulk updates.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._catalog_version = 0
+        self._pending_programs = set()
+        self._universities_dirty = False
+        self._reset()
+
+    def _reset(self):
+        self._positions = {}        # program_id -> position
+        self._rows = []             # position -> program row (None once deleted)
+        self._keys = []             # position -> (area, degree_level, mode)
+        self._matrix = None         # _FeatureMatrix, rebuilt lazily after changes
+        self._university_names = {}
+
+    # ------------------- CHANGE TRACKING -------------------
+    @property
+    def catalog_version(self):
+        """Counter bumped on every committed Program/University insert, update or delete."""
+        return self._catalog_version
+
+    def mark_programs_changed(self, program_ids):
+        with self._lock:
+            self._pending_programs.update(program_ids)
+            self._catalog_version += 1
+
+    def mark_universities_changed(self):
+        with self._lock:
+            self._universities_dirty = True
+            self._catalog_version += 1
+
+    def invalidate(self):
+        """Force a full rebuild on the next lookup."""
+        with self._lock:
+            self._built_at = None
+            self._catalog_version += 1
+
+    # ------------------- BUILDING -------------------
+    @staticmethod
+    def _program_columns():
+        return db.session.query(
+            Program.program_id,
+            Program.name,
+            Program.degree_level,
+            Program.mode,
+            Program.duration,
+            Program.fee,
+            Program.area_of_study,
+            Program.requirements,
+            Program.uni_id
+        )
+
+    def _load_universities(self):
+        self._university_names = dict(db.session.query(University.uni_id, University.name).all())
+        self._universities_dirty = False
+        self._matrix = None
+
+    def _rebuild(self):
+        self._reset()
+        self._pending_programs.clear()
+        for row in self._program_columns().order_by(Program.program_id).all():
+            self._add(row)
+        self._load_universities()
+        self._built_at = time.monotonic()
+
+    def _add(self, row):
+        position = len(self._rows)
+        keys = (_normalize(row.area_of_study), _normalize(row.degree_level), _normalize(row.mode))
+
+        self._positions[row.program_id] = position
+        self._rows.append({
+            'program_id': row.program_id,
+            'program_name': row.name,
+            'degree_level': row.degree_level,
+            'mode': row.mode,
+            'duration': row.duration,
+            'fee': row.fee,
+            'area_of_study': row.area_of_study,
+            'requirements': row.requirements,
+            'university_id': row.uni_id
+        })
+        self._keys.append(keys)
+        self._matrix = None
+
+    def _remove(self, program_id):
+        position = self._positions.pop(program_id, None)
+        if position is None:
+            return
+        self._rows[position] = None
+        self._keys[position] = None
+        self._matrix = None
+
+    def _refresh_programs(self):
+        program_ids = list(self._pending_programs)
+        self._pending_programs.clear()
+        for program_id in program_ids:
+            self._remove(program_id)
+        # Re-read the committed state; rows that no longer exist stay removed
+        rows = self._program_columns().filter(Program.program_id.in_(program_ids)).order_by(Program.program_id).all()
+        for row in rows:
+            self._add(row)
+
+    def _ensure_fresh(self):
+        ttl = current_app.config.get('RECOMMENDATION_INDEX_TTL', 300)
+        if self._built_at is None or time.monotonic() - self._built_at > ttl:
+            if self._built_at is not None:
+                # A periodic rebuild may pick up changes made by other processes
+                self._catalog_version += 1
+            self._rebuild()
+            return
+        if self._pending_programs:
+            self._refresh_programs()
+        if self._universities_dirty:
+            self._load_universities()
+
+    # ------------------- RANKING -------------------
+    def _feature_matrix(self):
+        if self._matrix is None:
+            self._matrix = _FeatureMatrix(self._rows, self._keys, self._university_names)
+        return self._matrix
+
+    def rank(self, areas_list, degree_level=None, mode=None, max_fee=None, limit=10):
+        """
+        Score every program against a profile and return the best matches.
+
+        Args:
+            areas_list (list): Normalized (lowercase, stripped) areas of interest
+            degree_level (str): Preferred degree level
+            mode (str): Preferred mode of study
+            max_fee (float): Optional budget, programs above it score lower
+            limit (int): Maximum number of programs to return
+
+        Returns:
+            list: Recommendation dicts ordered by score, same shape as get_recommendations
+        """
+        with self._lock:
+            self._ensure_fresh()
+            matrix = self._feature_matrix()
+        # The matrix is immutable once built, so scoring can run outside the lock
+        return matrix.top_k(areas_list, degree_level, mode, max_fee, limit)
+
+
+# Score weights. Any area match outweighs degree + mode + fee together, so the
+# ranking keeps the order of the old strict -> areas only -> default fallbacks.
+AREA_MATCH_WEIGHT = 4.0
+AREA_OVERLAP_WEIGHT = 1.0
+DEGREE_MATCH_WEIGHT = 2.0
+MODE_MATCH_WEIGHT = 1.0
+FEE_FIT_WEIGHT = 0.5
+
+
+class _FeatureMatrix:
+    """Column-oriented snapshot of the index used for vectorized scoring."""
+
+    def __init__(self, rows, keys, university_names):
+        import numpy as np  # Imported lazily, only needed once a recommendation is ranked
+
+        self.np = np
+        self.rows = list(rows)
+        self.university_names = university_names
+
+        self.area_vocab = sorted({key[0] for key in keys if key is not None})
+        area_codes = {area: code for code, area in enumerate(self.area_vocab)}
+        self.degree_codes = {}
+        self.mode_codes = {}
+        for key in keys:
+            if key is not None:
+                self.degree_codes.setdefault(key[1], len(self.degree_codes))
+                self.mode_codes.setdefault(key[2], len(self.mode_codes))
+
+        # Deleted positions point at a sentinel area code and never match a degree/mode
+        dead = len(self.area_vocab)
+        self.area = np.fromiter((area_codes[k[0]] if k else dead for k in keys), dtype=np.int32, count=len(keys))
+        self.degree = np.fromiter((self.degree_codes[k[1]] if k else -1 for k in keys), dtype=np.int32, count=len(keys))
+        self.mode = np.fromiter((self.mode_codes[k[2]] if k else -1 for k in keys), dtype=np.int32, count=len(keys))
+        self.fee = np.fromiter(
+            (row['fee'] if row and row['fee'] is not None else np.nan for row in rows),
+            dtype=np.float64, count=len(rows)
+        )
+        self.live = np.fromiter((k is not None for k in keys), dtype=bool, count=len(keys))
+        self.live_count = int(self.live.sum())
+        self._term_codes = {}
+
+    def _area_term_codes(self, term):
+        codes = self._term_codes.get(term)
+        if codes is None:
+            codes = [code for code, area in enumerate(self.area_vocab) if term in area]
+            self._term_codes[term] = codes
+        return codes
+
+    def scores(self, areas_list, degree_level=None, mode=None, max_fee=None):
+        np = self.np
+        scores = np.zeros(len(self.rows))
+
+        if areas_list:
+            # Number of query terms matched by each area, gathered per program
+            hits_per_area = np.zeros(len(self.area_vocab) + 1)
+            for term in areas_list:
+                hits_per_area[self._area_term_codes(term)] += 1
+            overlap = hits_per_area[self.area]
+            scores += AREA_MATCH_WEIGHT * (overlap > 0) + AREA_OVERLAP_WEIGHT * overlap / len(areas_list)
+
+        if degree_level:
+            scores += DEGREE_MATCH_WEIGHT * (self.degree == self.degree_codes.get(_normalize(degree_level), -2))
+
+        if mode:
+            scores += MODE_MATCH_WEIGHT * (self.mode == self.mode_codes.get(_normalize(mode), -2))
+
+        # Fees only count against a budget; without one, price does not affect the ranking
+        if max_fee is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                fee_fit = np.where(self.fee <= max_fee, 1.0, max_fee / self.fee)
+            # Programs without a fee get no fee bonus
+            scores += FEE_FIT_WEIGHT * np.nan_to_num(fee_fit, nan=0.0, posinf=0.0, neginf=0.0)
+
+        scores[~self.live] = -np.inf
+        return scores
+
+    def top_k(self, areas_list, degree_level=None, mode=None, max_fee=None, limit=10):
+        np = self.np
+        k = min(limit, self.live_count)
+        if k <= 0:
+            return []
+
+        scores = self.scores(areas_list, degree_level, mode, max_fee)
+
+        # O(n) selection of the k-th best score, then an exact sort of everything
+        # at least that good; ties are broken by position (lowest program_id first)
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        candidates = np.flatnonzero(scores >= kth_score)
+        order = np.lexsort((candidates, -scores[candidates]))[:k]
+
+        return [
+            dict(self.rows[position], university_name=self.university_names.get(self.rows[position]['university_id'], "Unknown"))
+            for position in candidates[order]
+        ]
+
+
+recommendation_index = RecommendationIndex()
+
+
+# ------------------- CATALOG CHANGE EVENTS -------------------
+def _apply_catalog_changes(changes):
+    if changes.get(Program):
+        recommendation_index.mark_programs_changed(changes[Program])
+    if University in changes:
+        recommendation_index.mark_universities_changed()
+
+
+# Only hand changes to the index once they are committed, so a concurrent
+# lookup never re-reads rows that may still be rolled back
+on_commit((Program, University), _apply_catalog_changes)
@@ -0,0 +1,55 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+from app.utils.recommendation_helper import get_recommendations
+
+
+class RecommendationJobs:
+    """
+    Computes recommendations on a small worker pool, off the login/registration
+    request path.
+
+    A finished job warms the per-profile recommendation cache, so the
+    recommendations endpoint can answer from it. Jobs are remembered per user
+    (bounded, oldest dropped first) so the endpoint can tell "still computing"
+    apart from "never scheduled in this process".
+    """
+
+    def __init__(self, app, max_workers=4, max_jobs=10000):
+        self._app = app
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='recommendations')
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # user_id -> (profile, future)
+        self._max_jobs = max_jobs
+
+    def _run(self, profile):
+        with self._app.app_context():
+            return get_recommendations(**profile)
+
+    def submit(self, user_id, areas_of_interest=None, degree_level=None, mode=None):
+        profile = {'areas_of_interest': areas_of_interest, 'degree_level': degree_level, 'mode': mode}
+        future = self._executor.submit(self._run, profile)
+        with self._lock:
+            self._jobs[user_id] = (profile, future)
+            self._jobs.move_to_end(user_id)
+            while len(self._jobs) > self._max_jobs:
+                self._jobs.popitem(last=False)
+        return future
+
+    def get(self, user_id):
+        """Return (profile, future) for the user's latest job, or None."""
+        with self._lock:
+            return self._jobs.get(user_id)
+
+
+def recommendation_jobs():
+    jobs = current_app.extensions.get('recommendation_jobs')
+    if jobs is None:
+        jobs = current_app.extensions.setdefault('recommendation_jobs', RecommendationJobs(
+            current_app._get_current_object(),
+            max_workers=current_app.config.get('RECOMMENDATION_WORKERS', 4)
+        ))
+    return jobs
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from app.models import Consultant, ConsultantTimeSlot, ConsultantSlotWatermark, Booking
+from app.extensions import db
+from app.utils.availability_cache import availability_cache
+from app.utils.time_slot_generator import (
+    weekly_template, configured_holidays, working_days, missing_time_slots, insert_time_slots, slot_days
+)
+
+
+def roll_slot_horizon(weeks=4, batch_size=100, today=None):
+    """
+    Keep a rolling `weeks`-week horizon of time slots for every consultant.
+
+    Consultants are processed in id order, `batch_size` at a time, with one
+    commit per batch. Each consultant's watermark records the last date slots
+    were generated for, so a run only generates the days added since the
+    previous one. Consultants without a watermark start from today; slots that
+    already exist (e.g. from registration) are skipped.
+
+    Returns a dict with the number of consultants processed and slots created.
+    """
+    today = today or date.today()
+    horizon_end = today + timedelta(weeks=weeks) - timedelta(days=1)
+    holidays = configured_holidays()
+    stats = {'consultants': 0, 'slots_created': 0}
+
+    last_id = 0
+    while True:
+        batch = db.session.query(
+            Consultant.id,
+            Consultant.presence,
+            Consultant.employment_type,
+            ConsultantSlotWatermark.generated_through
+        ).outerjoin(
+            ConsultantSlotWatermark, ConsultantSlotWatermark.consultant_id == Consultant.id
+        ).filter(Consultant.id > last_id).order_by(Consultant.id).limit(batch_size).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        consultant_dates = []
+        for consultant in batch:
+            start_date = today
+            if consultant.generated_through and consultant.generated_through >= today:
+                start_date = consultant.generated_through + timedelta(days=1)
+            if start_date <= horizon_end:
+                consultant_dates.append((
+                    consultant.id,
+                    weekly_template(consultant.presence, consultant.employment_type),
+                    working_days(start_date, horizon_end, holidays)
+                ))
+
+        new_slots = missing_time_slots(consultant_dates)
+        stats['slots_created'] += insert_time_slots(new_slots, commit=False)
+        _advance_watermarks(batch, horizon_end)
+        db.session.commit()
+        availability_cache().invalidate(slot_days(new_slots))
+        stats['consultants'] += len(batch)
+
+    return stats
+
+
+def _advance_watermarks(batch, horizon_end):
+    known = [c.id for c in batch if c.generated_through is not None and c.generated_through < horizon_end]
+    new = [c.id for c in batch if c.generated_through is None]
+    if known:
+        db.session.execute(
+            ConsultantSlotWatermark.__table__.update()
+            .where(ConsultantSlotWatermark.__table__.c.consultant_id.in_(known))
+            .values(generated_through=horizon_end)
+        )
+    if new:
+        db.session.execute(
+            ConsultantSlotWatermark.__table__.insert(),
+            [{'consultant_id': consultant_id, 'generated_through': horizon_end} for consultant_id in new]
+        )
+
+
+def prune_expired_slots(batch_size=1000, today=None):
+    """
+    Delete unbooked slots dated before today, `batch_size` rows per statement.
+
+    Slots referenced by any booking are kept for the booking history.
+    Returns the number of slots deleted.
+    """
+    today = today or date.today()
+    deleted = 0
+    while True:
+        slot_ids = [row.slot_id for row in db.session.query(ConsultantTimeSlot.slot_id).filter(
+            ConsultantTimeSlot.date < today,
+            ConsultantTimeSlot.is_available == True,
+            ~db.session.query(Booking.booking_id).filter(Booking.time_slot_id == ConsultantTimeSlot.slot_id).exists()
+        ).limit(batch_size).all()]
+        if not slot_ids:
+            break
+        db.session.execute(
+            ConsultantTimeSlot.__table__.delete().where(ConsultantTimeSlot.__table__.c.slot_id.in_(slot_ids))
+        )
+        db.session.commit()
+        deleted += len(slot_ids)
+    if deleted:
+        availability_cache().clear()
+    return deleted
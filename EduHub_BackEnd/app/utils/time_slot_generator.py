@@ -1,83 +1,182 @@
 from datetime import datetime, timedelta, date
+from functools import lru_cache
+from flask import current_app
 from app.models import Consultant, ConsultantTimeSlot
 from app.extensions import db
+from app.utils.availability_cache import availability_cache
 
-def generate_consultant_time_slots(consultant_id=None, num_weeks=1, start_date=None):
+# Define time slots
+MORNING_SLOTS = [
+    ("09:00", "10:00"),
+    ("10:00", "11:00"),
+    ("11:00", "12:00")
+]
+
+AFTERNOON_SLOTS = [
+    ("15:00", "16:00"),
+    ("16:00", "17:00"),
+    ("17:00", "18:00")
+]
+
+
+@lru_cache(maxsize=None)
+def weekly_template(presence, employment_type=None):
     """
-    Generate time slots for consultants based on their presence.
-    
+    Weekly slot template (Monday..Sunday) for a consultant profile.
+
+    Full-time consultants ('Online' presence or 'full-time' employment) get
+    morning + afternoon slots, everyone else gets morning slots only.
+    Weekends are empty. Templates are cached per (presence, employment_type).
+    """
+    if presence == 'Online' or employment_type == 'full-time':
+        daily_slots = tuple(MORNING_SLOTS + AFTERNOON_SLOTS)
+    else:  # 'Offline' / part-time or any other value defaults to morning only
+        daily_slots = tuple(MORNING_SLOTS)
+    return (daily_slots,) * 5 + ((), ())
+
+
+def configured_holidays():
+    """Holiday dates from the SLOT_HOLIDAYS config ('YYYY-MM-DD' strings)."""
+    return frozenset(
+        datetime.strptime(day, '%Y-%m-%d').date() for day in current_app.config.get('SLOT_HOLIDAYS', [])
+    )
+
+
+def business_days(start_date, count, holidays=frozenset()):
+    """
+    The first `count` Monday-Friday dates on or after start_date, minus holidays.
+
+    Uses closed-form date arithmetic: the k-th business day after a weekday w
+    is k + 2 * ((w + k) // 5) calendar days later, so weekends never consume
+    any of the `count` days.
+    """
+    weekday = start_date.weekday()
+    if weekday >= 5:  # Start on a weekend: roll forward to Monday
+        start_date += timedelta(days=7 - weekday)
+        weekday = 0
+    days = [start_date + timedelta(days=k + 2 * ((weekday + k) // 5)) for k in range(count)]
+    return [day for day in days if day not in holidays]
+
+
+def working_days(start_date, end_date, holidays=frozenset()):
+    """Monday-Friday dates from start_date to end_date (inclusive), minus holidays."""
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    return [day for day in days if day.weekday() < 5 and day not in holidays]
+
+
+def generate_consultant_time_slots(consultant_id=None, num_weeks=1, start_date=None, holidays=None, overrides=None):
+    """
+    Generate time slots for consultants based on their presence and employment type.
+
     Parameters:
     - consultant_id: If provided, generate slots only for this consultant. If None, generate for all consultants.
-    - num_weeks: Number of weeks to generate slots for (default: 1 week)
+    - num_weeks: Number of weeks to generate slots for (default: 1 week), i.e. num_weeks * 5 working days
     - start_date: Starting date for slot generation (default: today)
-    
-    Time slots logic:
+    - holidays: Dates to skip (default: SLOT_HOLIDAYS config)
+    - overrides: Optional {consultant_id: weekly template} replacing a consultant's default template
+
+    Time slots logic (see weekly_template):
     - Part-time consultants (Offline): 3 slots per day (9:00-10:00, 10:00-11:00, 11:00-12:00), Monday-Friday
-    - Full-time consultants (Online): 6 slots per day (9:00-10:00, 10:00-11:00, 11:00-12:00, 15:00-16:00, 16:00-17:00, 17:00-18:00), Monday-Friday
+    - Full-time consultants (Online or full-time): 6 slots per day (9:00-10:00, 10:00-11:00, 11:00-12:00, 15:00-16:00, 16:00-17:00, 17:00-18:00), Monday-Friday
     """
     if start_date is None:
         start_date = date.today()
-    
-    # Define time slots
-    morning_slots = [
-        ("09:00", "10:00"),
-        ("10:00", "11:00"),
-        ("11:00", "12:00")
-    ]
-    
-    afternoon_slots = [
-        ("15:00", "16:00"),
-        ("16:00", "17:00"),
-        ("17:00", "18:00")
-    ]
-    
-    # Get consultants
+    if holidays is None:
+        holidays = configured_holidays()
+    overrides = overrides or {}
+
+    # Get consultants (only the columns needed to pick their template)
+    query = db.session.query(Consultant.id, Consultant.presence, Consultant.employment_type)
     if consultant_id:
-        consultants = Consultant.query.filter_by(id=consultant_id).all()
-    else:
-        consultants = Consultant.query.all()
-    
-    slots_created = 0
-    
-    for consultant in consultants:
-        # Determine which slots to use based on presence
-        # 'Online' = Full-time (morning + afternoon)
-        # 'Offline' = Part-time (morning only)
-        if consultant.presence == 'Online':
-            daily_slots = morning_slots + afternoon_slots
-        else:  # 'Offline' or any other value defaults to part-time
-            daily_slots = morning_slots
-        
-        # Generate slots for the specified number of weeks
-        current_date = start_date
-        for _ in range(num_weeks * 5):  # 5 working days per week
-            # Skip weekends
-            if current_date.weekday() >= 5:  # 5 = Saturday, 6 = Sunday
-                current_date += timedelta(days=1)
-                continue
-            
-            for start_time, end_time in daily_slots:
-                # Check if this slot already exists & pevents duplicates
-                existing_slot = ConsultantTimeSlot.query.filter_by(
-                    consultant_id=consultant.id,
-                    date=current_date,
-                    start_time=start_time,
-                    end_time=end_time
-                ).first()
-                
-                # Only create if it doesn't exist
-                if not existing_slot:
-                    new_slot = ConsultantTimeSlot(
-                        consultant_id=consultant.id,
-                        date=current_date,
-                        start_time=start_time,
-                        end_time=end_time,
-                        is_available=True
-                    )
-                    db.session.add(new_slot)
-                    slots_created += 1
-            
-            current_date += timedelta(days=1)
-    
-    db.session.commit()
-    return slots_created
+        query = query.filter(Consultant.id == consultant_id)
+    consultants = query.all()
+
+    # Working days covered by the requested weeks
+    dates = business_days(start_date, num_weeks * 5, holidays)
+
+    new_slots = missing_time_slots(
+        [
+            (
+                consultant.id,
+                overrides.get(consultant.id) or weekly_template(consultant.presence, consultant.employment_type),
+                dates
+            )
+            for consultant in consultants
+        ],
+        restrict_to_consultants=bool(consultant_id)
+    )
+    return insert_time_slots(new_slots)
+
+
+def missing_time_slots(consultant_dates, restrict_to_consultants=True):
+    """
+    Compute the slot rows that do not exist yet.
+
+    Parameters:
+    - consultant_dates: list of (consultant_id, weekly template, dates) tuples
+    - restrict_to_consultants: filter the existence query by consultant id
+      (pass False when generating for every consultant)
+
+    Existing (consultant_id, date, start_time) keys for the whole date range are
+    pre-fetched with one query; the missing set is computed in memory.
+    """
+    all_dates = [slot_date for _, _, dates in consultant_dates for slot_date in dates]
+    if not all_dates:
+        return []
+
+    existing_query = db.session.query(
+        ConsultantTimeSlot.consultant_id,
+        ConsultantTimeSlot.date,
+        ConsultantTimeSlot.start_time
+    ).filter(ConsultantTimeSlot.date.between(min(all_dates), max(all_dates)))
+    if restrict_to_consultants:
+        existing_query = existing_query.filter(
+            ConsultantTimeSlot.consultant_id.in_([consultant_id for consultant_id, _, _ in consultant_dates])
+        )
+    existing_keys = set(existing_query.all())
+
+    # Expand each template over its dates
+    return [
+        {
+            'consultant_id': consultant_id,
+            'date': slot_date,
+            'start_time': start_time,
+            'end_time': end_time,
+            'is_available': True
+        }
+        for consultant_id, template, dates in consultant_dates
+        for slot_date in dates
+        for start_time, end_time in template[slot_date.weekday()]
+        if (consultant_id, slot_date, start_time) not in existing_keys
+    ]
+
+
+def slot_days(slot_rows):
+    """(consultant_id, date) availability cache keys touched by `slot_rows`."""
+    return {(row['consultant_id'], row['date']) for row in slot_rows}
+
+
+def insert_time_slots(slot_rows, commit=True):
+    """
+    Bulk insert slot rows in a single executemany.
+
+    Rows that collide with the (consultant_id, date, start_time) unique constraint,
+    e.g. from a concurrent run, are skipped, so reruns are idempotent. The
+    affected days are dropped from the availability cache once committed; with
+    commit=False the caller commits and then invalidates slot_days(slot_rows),
+    so no request reloads a day from uncommitted data.
+    Returns the number of slots created.
+    """
+    if not slot_rows:
+        return 0
+
+    statement = (
+        ConsultantTimeSlot.__table__.insert()
+        .prefix_with('OR IGNORE', dialect='sqlite')
+        .prefix_with('IGNORE', dialect='mysql')
+    )
+    result = db.session.execute(statement, slot_rows)
+    if commit:
+        db.session.commit()
+        availability_cache().invalidate(slot_days(slot_rows))
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else len(slot_rows)
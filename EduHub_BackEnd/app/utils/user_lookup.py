@@ -0,0 +1,30 @@
+from sqlalchemy.orm import with_polymorphic
+from app.models import BaseUser, Admin, User, Consultant
+from app.extensions import db
+
+# Loads base_users LEFT OUTER JOINed with every subclass table, so a single
+# round-trip returns a fully loaded Admin, User or Consultant
+_any_user = with_polymorphic(BaseUser, [Admin, User, Consultant])
+
+
+def find_user_by_email(email):
+    """
+    Look up an account of any type by email.
+
+    Args:
+        email (str): Email to look up (uses the unique index on base_users.email)
+
+    Returns:
+        Admin|User|Consultant: The matching account, or None
+    """
+    if not email:
+        return None
+    return db.session.query(_any_user).filter(
+        _any_user.email == email,
+        _any_user.user_type.in_(['admin', 'user', 'consultant'])
+    ).first()
+
+
+def email_exists(email):
+    """Check email uniqueness across all account types without joining subclass tables."""
+    return db.session.query(BaseUser.id).filter_by(email=email).first() is not None
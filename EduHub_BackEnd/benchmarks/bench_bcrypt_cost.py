@@ -0,0 +1,79 @@
+"""
+Measure login latency at different bcrypt cost factors.
+
+For every cost factor an account is created at that cost, then a burst of
+concurrent logins is sent through POST /api/auth/login and p50/p99 latency,
+throughput and 503 rejections are reported. Use it to pick BCRYPT_LOG_ROUNDS
+from data for the hardware the app runs on.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.bench_bcrypt_cost
+    python -m benchmarks.bench_bcrypt_cost --costs 10 11 12 13 --logins 100 --concurrency 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Admin
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench_cost(cost, logins, concurrency, workers):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        BCRYPT_LOG_ROUNDS = cost
+        BCRYPT_POOL_WORKERS = workers
+        BCRYPT_POOL_QUEUE_SIZE = logins
+        BCRYPT_POOL_TIMEOUT = 600
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        admin = Admin(email='bench@example.com', name='bench')
+        admin.set_password('password123')
+        db.session.add(admin)
+        db.session.commit()
+
+    def login(_):
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.post('/api/auth/login', json={'email': 'bench@example.com', 'password': 'password123'})
+        return response.status_code, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [ms for status, ms in results if status == 200]
+    rejected = sum(1 for status, _ in results if status == 503)
+    return latencies, rejected, logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--costs', type=int, nargs='+', default=[10, 11, 12, 13])
+    parser.add_argument('--logins', type=int, default=50)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=Config.BCRYPT_POOL_WORKERS)
+    args = parser.parse_args()
+
+    print(f"{'cost':>5} {'p50 ms':>9} {'p99 ms':>9} {'logins/s':>9} {'503s':>5}")
+    for cost in args.costs:
+        latencies, rejected, throughput = bench_cost(cost, args.logins, args.concurrency, args.workers)
+        if latencies:
+            print(f"{cost:>5} {percentile(latencies, 50):>9.1f} {percentile(latencies, 99):>9.1f} "
+                  f"{throughput:>9.1f} {rejected:>5}")
+        else:
+            print(f"{cost:>5} {'-':>9} {'-':>9} {throughput:>9.1f} {rejected:>5}")
+
+
+if __name__ == '__main__':
+    main()
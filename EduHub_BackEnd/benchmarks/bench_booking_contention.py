@@ -0,0 +1,137 @@
+"""
+Concurrency check for POST /api/booking/createBooking.
+
+Many students race for a handful of time slots from a thread pool. Every slot
+must end up with exactly one successful (201) booking and at most one active
+booking row; the script exits non-zero otherwise. The previous
+read-then-write check let several requests book the same slot.
+
+The default database is a temporary SQLite file (shared between threads);
+pass --database-url to run against MySQL, where the race is more realistic.
+The target database is dropped and recreated.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.bench_booking_contention
+    python -m benchmarks.bench_booking_contention --students 400 --slots 5 --concurrency 64
+    python -m benchmarks.bench_booking_contention --database-url mysql+pymysql://user:pw@localhost/eduhub_bench
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import BaseUser, User, Consultant, ConsultantTimeSlot, Booking
+
+
+def seed(num_students, num_slots):
+    db.drop_all()
+    db.create_all()
+    consultant = Consultant(email='consultant@example.com', name='Consultant', password='x', presence='Online')
+    db.session.add(consultant)
+    db.session.flush()
+    slot_date = date.today() + timedelta(days=7)
+    slots = [
+        ConsultantTimeSlot(consultant_id=consultant.id, date=slot_date, start_time=f'{9 + index:02d}:00',
+                           end_time=f'{10 + index:02d}:00', is_available=True)
+        for index in range(num_slots)
+    ]
+    db.session.add_all(slots)
+    first_id = consultant.id + 1
+    ids = range(first_id, first_id + num_students)
+    db.session.execute(BaseUser.__table__.insert(), [
+        {'id': user_id, 'user_type': 'user', 'name': f'Student {user_id}', 'email': f'student{user_id}@example.com',
+         'password': 'x'}
+        for user_id in ids
+    ])
+    db.session.execute(User.__table__.insert(), [{'id': user_id} for user_id in ids])
+    db.session.commit()
+    tokens = [create_access_token(identity=str(user_id), additional_claims={'user_type': 'user'}) for user_id in ids]
+    return [slot.slot_id for slot in slots], tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--slots', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--database-url')
+    args = parser.parse_args()
+
+    database_file = None
+    database_url = args.database_url
+    if not database_url:
+        handle, database_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        database_url = f'sqlite:///{database_file}'
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        # SQLite serializes writers; let them wait for the lock instead of failing
+        SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'timeout': 30}} if database_url.startswith('sqlite') else {}
+
+    app = create_app(BenchmarkConfig)
+    try:
+        with app.app_context():
+            slot_ids, tokens = seed(args.students, args.slots)
+
+        def book(index):
+            client = app.test_client()
+            slot_id = slot_ids[index % len(slot_ids)]
+            response = client.post('/api/booking/createBooking', json={'time_slot_id': slot_id},
+                                   headers={'Authorization': f'Bearer {tokens[index]}'})
+            return slot_id, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(book, range(args.students)))
+        elapsed = time.perf_counter() - started
+
+        created = Counter(slot_id for slot_id, status in results if status == 201)
+        statuses = Counter(status for _, status in results)
+        with app.app_context():
+            active = dict(
+                db.session.query(Booking.time_slot_id, func.count(Booking.booking_id))
+                .filter(Booking.status != 'Cancelled')
+                .group_by(Booking.time_slot_id)
+                .all()
+            )
+            still_available = db.session.query(func.count(ConsultantTimeSlot.slot_id)).filter(
+                ConsultantTimeSlot.is_available == True
+            ).scalar()
+
+        print(f"{args.students} requests over {len(slot_ids)} slots in {elapsed:.2f}s "
+              f"({args.students / elapsed:.0f} req/s), statuses: {dict(sorted(statuses.items()))}")
+        failures = []
+        for slot_id in slot_ids:
+            print(f"slot {slot_id}: {created.get(slot_id, 0)} x 201, {active.get(slot_id, 0)} active booking(s)")
+            if created.get(slot_id, 0) != 1:
+                failures.append(f'slot {slot_id} got {created.get(slot_id, 0)} successful bookings')
+            if active.get(slot_id, 0) > 1:
+                failures.append(f'slot {slot_id} has {active[slot_id]} active bookings')
+        if still_available:
+            failures.append(f'{still_available} booked slot(s) still marked available')
+        unexpected = {status: count for status, count in statuses.items() if status not in (201, 400)}
+        if unexpected:
+            failures.append(f'unexpected responses: {unexpected}')
+
+        if failures:
+            print('FAIL: ' + '; '.join(failures))
+            sys.exit(1)
+        print('OK: exactly one booking per slot')
+    finally:
+        if database_file:
+            os.remove(database_file)
+
+
+if __name__ == '__main__':
+    main()
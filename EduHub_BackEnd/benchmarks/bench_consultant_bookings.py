@@ -0,0 +1,111 @@
+"""
+Regression benchmark: consultant getBookings as the users table grows.
+
+One consultant with a fixed number of bookings is measured while the users
+table grows. The previous implementation loaded every User and ran a
+per-booking time slot lookup, so its cost grew with the users table. The
+joined query should stay flat.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.bench_consultant_bookings
+    python -m benchmarks.bench_consultant_bookings --users 1000 10000 50000 --bookings 50
+"""
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy import event
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import BaseUser, User, Consultant, ConsultantTimeSlot, Booking
+from app.utils.booking_queries import consultant_booking_rows_query
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+
+def legacy_consultant_bookings(consultant_id):
+    """The previous implementation, kept for comparison."""
+    bookings = Booking.query.filter_by(consultant_id=consultant_id).all()
+    users = User.query.all()
+    booking_list = []
+    for booking in bookings:
+        time_slot = ConsultantTimeSlot.query.get(booking.time_slot_id)
+        user = next((u for u in users if u.id == booking.user_id), None)
+        booking_list.append((booking.booking_id, user.name if user else "Unknown", time_slot.date))
+    return booking_list
+
+
+def joined_consultant_bookings(consultant_id):
+    return consultant_booking_rows_query(consultant_id).order_by(Booking.booking_id).all()
+
+
+def grow_users(target, current):
+    """Add plain student accounts until the users table has `target` rows."""
+    if target <= current:
+        return current
+    first_id = (db.session.query(db.func.max(BaseUser.id)).scalar() or 0) + 1
+    ids = range(first_id, first_id + target - current)
+    db.session.execute(BaseUser.__table__.insert(), [
+        {'id': user_id, 'user_type': 'user', 'name': f'User {user_id}', 'email': f'user{user_id}@example.com', 'password': 'x'}
+        for user_id in ids
+    ])
+    db.session.execute(User.__table__.insert(), [{'id': user_id, 'phone': '0700000000'} for user_id in ids])
+    db.session.commit()
+    return target
+
+
+def seed_consultant(num_bookings):
+    consultant = Consultant(email='consultant@example.com', name='Consultant', password='x', presence='Online')
+    student = User(email='student@example.com', name='Student', password='x')
+    db.session.add_all([consultant, student])
+    db.session.commit()
+    for index in range(num_bookings):
+        slot = ConsultantTimeSlot(consultant_id=consultant.id, date=date(2030, 1, 1 + index % 28),
+                                  start_time=f'{index // 28:02d}:00', end_time='23:59', is_available=False)
+        db.session.add(slot)
+        db.session.flush()
+        db.session.add(Booking(user_id=student.id, consultant_id=consultant.id, time_slot_id=slot.slot_id))
+    db.session.commit()
+    return consultant.id
+
+
+def measure(fn, consultant_id, statements, repeat=5):
+    db.session.expunge_all()
+    statements.clear()
+    fn(consultant_id)
+    queries = len(statements)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        db.session.expunge_all()
+        fn(consultant_id)
+    return queries, (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--bookings', type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+        consultant_id = seed_consultant(args.bookings)
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *a: statements.append(a[2]))
+
+        print(f"{'users':>8} {'legacy ms':>10} {'legacy q':>9} {'joined ms':>10} {'joined q':>9}")
+        current = 1
+        for size in sorted(args.users):
+            current = grow_users(size, current)
+            legacy_queries, legacy_ms = measure(legacy_consultant_bookings, consultant_id, statements)
+            joined_queries, joined_ms = measure(joined_consultant_bookings, consultant_id, statements)
+            print(f"{size:>8} {legacy_ms:>10.2f} {legacy_queries:>9} {joined_ms:>10.2f} {joined_queries:>9}")
+
+
+if __name__ == '__main__':
+    main()
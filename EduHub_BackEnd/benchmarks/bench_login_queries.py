@@ -0,0 +1,72 @@
+"""
+Count the SQL statements issued to resolve a login by email.
+
+Compares the previous Admin -> User -> Consultant fallback chain (up to three
+joined queries) with the single polymorphic lookup used by login(), for an
+account of each type and for an unknown email, and times both.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.bench_login_queries
+"""
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Admin, User, Consultant
+from app.utils.user_lookup import find_user_by_email
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    BCRYPT_LOG_ROUNDS = 4
+
+
+def legacy_lookup(email):
+    return (
+        Admin.query.filter_by(email=email).first() or
+        User.query.filter_by(email=email).first() or
+        Consultant.query.filter_by(email=email).first()
+    )
+
+
+def seed():
+    db.create_all()
+    for model, email in ((Admin, 'admin@example.com'), (User, 'user@example.com'), (Consultant, 'consultant@example.com')):
+        account = model(email=email, name=email.split('@')[0])
+        account.set_password('password123')
+        db.session.add(account)
+    db.session.commit()
+
+
+def measure(lookup, email, statements, repeat=500):
+    db.session.expunge_all()
+    statements.clear()
+    lookup(email)
+    queries = len(statements)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        db.session.expunge_all()
+        lookup(email)
+    return queries, (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        seed()
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        print(f"{'email':<26} {'legacy queries':>15} {'legacy ms':>10} {'new queries':>12} {'new ms':>8}")
+        for email in ('admin@example.com', 'user@example.com', 'consultant@example.com', 'nobody@example.com'):
+            legacy_queries, legacy_ms = measure(legacy_lookup, email, statements)
+            new_queries, new_ms = measure(find_user_by_email, email, statements)
+            print(f"{email:<26} {legacy_queries:>15} {legacy_ms:>10.3f} {new_queries:>12} {new_ms:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark get_recommendations at different catalog sizes.
+
+Seeds an in-memory SQLite catalog with synthetic programs and reports the
+index build time plus p50/p99 latency of a ranked recommendation lookup.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.bench_recommendations
+    python -m benchmarks.bench_recommendations --sizes 1000 10000 100000 --queries 200
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Program, University
+from app.utils.recommendation_helper import get_recommendations
+from app.utils.recommendation_index import recommendation_index
+
+AREAS = [
+    'Computer Science', 'Data Science', 'Artificial Intelligence', 'Business Administration',
+    'Finance', 'Medicine', 'Nursing', 'Law', 'Civil Engineering', 'Mechanical Engineering',
+    'Electrical Engineering', 'Psychology', 'Education', 'Fine Arts', 'Architecture',
+    'Marketing', 'Biotechnology', 'Environmental Science', 'Journalism', 'Hospitality'
+]
+DEGREE_LEVELS = ['Bachelors', 'Masters', 'PhD', 'Diploma', 'Certificate']
+MODES = ['Online', 'On-Campus', 'Hybrid']
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+
+def seed_catalog(size, rng):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(University.__table__.insert(), [
+        {'uni_id': uni_id, 'name': f'University {uni_id}'} for uni_id in range(1, 201)
+    ])
+    db.session.execute(Program.__table__.insert(), [
+        {
+            'program_id': program_id,
+            'name': f'Program {program_id}',
+            'uni_id': rng.randint(1, 200),
+            'degree_level': rng.choice(DEGREE_LEVELS),
+            'mode': rng.choice(MODES),
+            'fee': float(rng.randrange(100000, 5000000, 1000)),
+            'area_of_study': rng.choice(AREAS)
+        }
+        for program_id in range(1, size + 1)
+    ])
+    db.session.commit()
+
+
+def random_profile(rng):
+    areas = ', '.join(area.split()[0] for area in rng.sample(AREAS, rng.randint(1, 3)))
+    return areas, rng.choice(DEGREE_LEVELS), rng.choice(MODES)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app(BenchmarkConfig)
+    rng = random.Random(args.seed)
+
+    print(f"{'programs':>10} {'build ms':>10} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    with app.app_context():
+        for size in args.sizes:
+            seed_catalog(size, rng)
+            recommendation_index.invalidate()
+
+            started = time.perf_counter()
+            get_recommendations(*random_profile(rng))  # First call builds the index and feature matrix
+            build_ms = (time.perf_counter() - started) * 1000
+
+            samples = []
+            for _ in range(args.queries):
+                profile = random_profile(rng)
+                started = time.perf_counter()
+                get_recommendations(*profile)
+                samples.append((time.perf_counter() - started) * 1000)
+
+            print(f"{size:>10} {build_ms:>10.1f} {percentile(samples, 50):>8.3f} "
+                  f"{percentile(samples, 99):>8.3f} {statistics.mean(samples):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark time slot generation against the previous per-slot implementation.
+
+The legacy generator ran one existence query per consultant x day x slot and
+added ORM objects one by one. The current one pre-fetches existing slot keys
+for the whole range in one query and bulk inserts the missing slots. Both are
+timed on a fresh database (first run) and on a rerun where every slot exists.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.bench_slot_generation
+    python -m benchmarks.bench_slot_generation --consultants 200 --weeks 4
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Consultant, ConsultantTimeSlot
+from app.utils.time_slot_generator import generate_consultant_time_slots
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+
+def legacy_generate_consultant_time_slots(consultant_id=None, num_weeks=1, start_date=None):
+    """The per-slot implementation this benchmark compares against."""
+    if start_date is None:
+        start_date = date.today()
+    morning_slots = [("09:00", "10:00"), ("10:00", "11:00"), ("11:00", "12:00")]
+    afternoon_slots = [("15:00", "16:00"), ("16:00", "17:00"), ("17:00", "18:00")]
+
+    if consultant_id:
+        consultants = Consultant.query.filter_by(id=consultant_id).all()
+    else:
+        consultants = Consultant.query.all()
+
+    slots_created = 0
+    for consultant in consultants:
+        daily_slots = morning_slots + afternoon_slots if consultant.presence == 'Online' else morning_slots
+        current_date = start_date
+        for _ in range(num_weeks * 5):
+            if current_date.weekday() >= 5:
+                current_date += timedelta(days=1)
+                continue
+            for start_time, end_time in daily_slots:
+                existing_slot = ConsultantTimeSlot.query.filter_by(
+                    consultant_id=consultant.id, date=current_date, start_time=start_time, end_time=end_time
+                ).first()
+                if not existing_slot:
+                    db.session.add(ConsultantTimeSlot(
+                        consultant_id=consultant.id, date=current_date,
+                        start_time=start_time, end_time=end_time, is_available=True
+                    ))
+                    slots_created += 1
+            current_date += timedelta(days=1)
+    db.session.commit()
+    return slots_created
+
+
+def seed(num_consultants):
+    db.drop_all()
+    db.create_all()
+    for index in range(num_consultants):
+        db.session.add(Consultant(
+            email=f'consultant{index}@example.com',
+            password='x',
+            presence='Online' if index % 2 else 'Offline'
+        ))
+    db.session.commit()
+
+
+def run(generator, weeks, start_date, statements):
+    statements.clear()
+    started = time.perf_counter()
+    created = generator(num_weeks=weeks, start_date=start_date)
+    return created, (time.perf_counter() - started) * 1000, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--consultants', type=int, default=200)
+    parser.add_argument('--weeks', type=int, default=4)
+    args = parser.parse_args()
+
+    app = create_app(BenchmarkConfig)
+    start_date = date.today()
+    with app.app_context():
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *a: statements.append(a[2]))
+
+        print(f"{'implementation':<10} {'run':<6} {'created':>8} {'ms':>10} {'queries':>8}")
+        for name, generator in (('legacy', legacy_generate_consultant_time_slots), ('bulk', generate_consultant_time_slots)):
+            seed(args.consultants)
+            for label in ('first', 'rerun'):
+                db.session.expunge_all()
+                created, ms, queries = run(generator, args.weeks, start_date, statements)
+                print(f"{name:<10} {label:<6} {created:>8} {ms:>10.1f} {queries:>8}")
+
+
+if __name__ == '__main__':
+    main()
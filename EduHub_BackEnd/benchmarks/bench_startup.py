@@ -0,0 +1,111 @@
+"""
+Benchmark app cold start: `import app` plus create_app().
+
+Every run uses a fresh interpreter. The benchmark reports the median import
+and create_app() times, peak RSS, how many modules got loaded and which heavy
+libraries (see check_eager_imports.HEAVY_MODULES) were among them. It also
+times the first /apispec_1.json request, where the API docs are built. The
+working tree is measured with API_DOCS_ENABLED on and off.
+--baseline exports the tree at another git revision (via git archive) and
+measures it too, so the before and after numbers come from the same run.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 20 --baseline HEAD~1
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+from benchmarks.check_eager_imports import HEAVY_MODULES
+
+PROBE = '''
+import json, resource, sys, time
+started = time.perf_counter()
+from app import create_app
+from app.config import Config
+imported = time.perf_counter()
+app = create_app(type('C', (Config,), {{'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'API_DOCS_ENABLED': {docs!r}}}))
+created = time.perf_counter()
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+modules = len(sys.modules)
+heavy = sorted(name for name in {heavy!r} if name in sys.modules)
+spec_status = app.test_client().get('/apispec_1.json').status_code
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'create_ms': (created - imported) * 1000,
+    'spec_ms': (time.perf_counter() - created) * 1000 if spec_status == 200 else None,
+    'rss_mb': rss_mb,
+    'modules': modules,
+    'heavy': heavy,
+}}))
+'''
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(tree, runs, docs=True):
+    """Median timings and memory over `runs` fresh interpreters started in `tree`."""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(heavy=HEAVY_MODULES, docs=docs)],
+            cwd=tree, capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {
+        'import_ms': statistics.median(sample['import_ms'] for sample in samples),
+        'create_ms': statistics.median(sample['create_ms'] for sample in samples),
+        'spec_ms': None if samples[-1]['spec_ms'] is None else statistics.median(
+            sample['spec_ms'] for sample in samples
+        ),
+        'rss_mb': statistics.median(sample['rss_mb'] for sample in samples),
+        'modules': statistics.median(sample['modules'] for sample in samples),
+        'heavy': samples[-1]['heavy'],
+    }
+
+
+def export_revision(ref, target):
+    """Extract EduHub_BackEnd as of git revision `ref` into `target`."""
+    toplevel, prefix = subprocess.run(
+        ['git', 'rev-parse', '--show-toplevel', '--show-prefix'],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    # git archive refuses to run from an untracked working directory, so run it from the top level
+    archive = subprocess.run(
+        ['git', 'archive', '--format=tar', f'{ref}:{prefix}'], cwd=toplevel, capture_output=True, check=True
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def report(label, stats):
+    spec = '-' if stats['spec_ms'] is None else f"{stats['spec_ms']:.1f}"
+    print(f"{label:<22} {stats['import_ms']:>9.1f} {stats['create_ms']:>13.1f} {spec:>13} "
+          f"{stats['rss_mb']:>8.1f} {stats['modules']:>8.0f}   {', '.join(stats['heavy']) or '-'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--baseline', metavar='REF', help='git revision to compare against, e.g. HEAD~1')
+    args = parser.parse_args()
+
+    print(f"{'tree':<22} {'import ms':>9} {'create_app ms':>13} {'1st spec ms':>13} "
+          f"{'RSS MB':>8} {'modules':>8}   heavy modules at startup")
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as baseline_dir:
+            export_revision(args.baseline, baseline_dir)
+            report(args.baseline, measure(baseline_dir, args.runs))
+    report('working tree, docs on', measure(BACKEND_DIR, args.runs, docs=True))
+    report('working tree, docs off', measure(BACKEND_DIR, args.runs, docs=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Check that starting the app does not import heavy libraries.
+
+Each scenario runs in a fresh interpreter: importing app.models (scripts and
+Alembic migrations), and create_app() (every web worker and `flask`
+command). The script exits non-zero if any module in HEAVY_MODULES gets
+imported, and prints the app frames that imported it.
+
+These libraries are still used, by `flask catalog import` (pandas, openpyxl),
+the recommendation ranking (numpy) and the API docs (flasgger), but they must
+be imported inside the code that needs them.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.check_eager_imports
+"""
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'flasgger')
+
+# Records where each heavy module is first imported from, then runs the scenario
+PROBE = '''
+import json, sys, traceback
+HEAVY = set({heavy!r})
+seen = {{}}
+
+class Probe:
+    def find_spec(self, name, path=None, target=None):
+        top = name.partition('.')[0]
+        # Keep the last lookup before the module loads: that one is the import
+        if top in HEAVY and top not in sys.modules:
+            seen[top] = [
+                f"{{frame.filename}}:{{frame.lineno}} {{frame.line}}"
+                for frame in traceback.extract_stack()[:-1] if '/app/' in frame.filename
+            ]
+        return None
+
+sys.meta_path.insert(0, Probe())
+{scenario}
+# find_spec also runs for packages that are only located, never imported
+print(json.dumps({{name: frames for name, frames in seen.items() if name in sys.modules}}))
+'''
+
+SCENARIOS = {
+    'import app.models': 'import app.models',
+    'create_app()': (
+        'from app import create_app\n'
+        'from app.config import Config\n'
+        "create_app(type('C', (Config,), {'SQLALCHEMY_DATABASE_URI': 'sqlite://'}))"
+    ),
+}
+
+
+def run_scenario(scenario):
+    """{heavy module: [app frames that imported it]} for one scenario run in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(heavy=HEAVY_MODULES, scenario=scenario)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    failures = 0
+    for name, scenario in SCENARIOS.items():
+        imported = run_scenario(scenario)
+        print(f"{'FAIL' if imported else 'ok':<5} {name}")
+        for module, frames in sorted(imported.items()):
+            failures += 1
+            print(f"      {module} imported eagerly from:")
+            for frame in frames or ['(outside app/)']:
+                print(f"        {frame}")
+    if failures:
+        sys.exit(1)
+    print(f"No eager imports of {', '.join(HEAVY_MODULES)}")
+
+
+if __name__ == '__main__':
+    main()
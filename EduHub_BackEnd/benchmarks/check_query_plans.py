@@ -0,0 +1,283 @@
+"""
+Check that the hot queries are served by indexes.
+
+Every route and background job below is run against a seeded database. The
+SQL statements each one executes are captured and EXPLAINed, and the script
+exits non-zero if any filtered statement falls back to a full table scan
+(SQLite: `SCAN <table>`, MySQL: access type ALL or index).
+
+Statements without a WHERE clause (whole-table counts and GROUP BYs, full
+listings) read everything by definition and are reported but allowed.
+Filtered whole-table aggregates that no index can serve are allowlisted per
+check, with the reason next to them. Scans of tables with fewer than
+SMALL_TABLE_ROWS rows (e.g. admins) are the cheapest plan and are ignored.
+
+Usage (from EduHub_BackEnd):
+    python -m benchmarks.check_query_plans
+    python -m benchmarks.check_query_plans --verbose
+    python -m benchmarks.check_query_plans --database-url mysql+pymysql://user:pw@localhost/eduhub_plans
+The target database is dropped and recreated.
+"""
+import argparse
+import re
+import sys
+from datetime import date, datetime, timedelta
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Admin, BaseUser, User, Consultant, ConsultantTimeSlot, Booking, Area, user_interests
+from app.utils.analytics_rollups import refresh_rollups
+from app.utils.availability_cache import availability_cache
+from app.utils.booking_slots import release_expired_holds
+from app.utils.slot_scheduler import roll_slot_horizon, prune_expired_slots
+from app.utils.time_slot_generator import generate_consultant_time_slots
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+SMALL_TABLE_ROWS = 100
+AREAS = ('Data Science', 'Business', 'Medicine', 'Computer Science', 'Arts')
+
+
+def seed(num_consultants, num_users, num_bookings):
+    """Consultants with four weeks of slots, students, and bookings spread over them (made over the last 60 days)."""
+    db.drop_all()
+    db.create_all()
+    admin = Admin(email='admin@example.com', name='Admin')
+    admin.set_password('password123')
+    db.session.add(admin)
+    db.session.flush()
+
+    first_id = admin.id + 1
+    consultant_ids = list(range(first_id, first_id + num_consultants))
+    user_ids = list(range(first_id + num_consultants, first_id + num_consultants + num_users))
+    db.session.execute(BaseUser.__table__.insert(), [
+        {'id': user_id, 'user_type': 'consultant', 'name': f'Consultant {user_id}',
+         'email': f'consultant{user_id}@example.com', 'password': 'x'}
+        for user_id in consultant_ids
+    ] + [
+        {'id': user_id, 'user_type': 'user', 'name': f'Student {user_id}',
+         'email': f'student{user_id}@example.com', 'password': 'x'}
+        for user_id in user_ids
+    ])
+    db.session.execute(Consultant.__table__.insert(), [
+        {'id': user_id, 'presence': 'Online' if user_id % 2 else 'Offline'} for user_id in consultant_ids
+    ])
+    db.session.execute(User.__table__.insert(), [
+        {'id': user_id, 'degree_level': 'Masters', 'mode': 'Online', 'areas_of_interest': f"{AREAS[user_id % len(AREAS)]}, {AREAS[(user_id + 1) % len(AREAS)]}",
+         'created_at': datetime.now() - timedelta(days=user_id % 60)}
+        for user_id in user_ids
+    ])
+    db.session.execute(Area.__table__.insert(), [
+        {'area_id': area_id, 'name': name.lower(), 'label': name} for area_id, name in enumerate(AREAS, start=1)
+    ])
+    db.session.execute(user_interests.insert(), [
+        {'user_id': user_id, 'area_id': area_id}
+        for user_id in user_ids for area_id in (user_id % len(AREAS) + 1, (user_id + 1) % len(AREAS) + 1)
+    ])
+    db.session.commit()
+
+    generate_consultant_time_slots(num_weeks=4, start_date=date.today() - timedelta(days=7))
+    slots = db.session.query(ConsultantTimeSlot.slot_id, ConsultantTimeSlot.consultant_id).order_by(
+        ConsultantTimeSlot.slot_id
+    ).limit(num_bookings).all()
+    statuses = ('Pending', 'Confirmed', 'Cancelled')
+    db.session.execute(Booking.__table__.insert(), [
+        {'user_id': user_ids[index % len(user_ids)], 'consultant_id': slot.consultant_id, 'time_slot_id': slot.slot_id,
+         'status': statuses[index % 3], 'booking_date': datetime.now() - timedelta(days=index % 60),
+         'active_time_slot_id': slot.slot_id if statuses[index % 3] != 'Cancelled' else None,
+         'hold_expires_at': datetime.now() + timedelta(minutes=15) if statuses[index % 3] == 'Pending' else None}
+        for index, slot in enumerate(slots)
+    ])
+    db.session.execute(ConsultantTimeSlot.__table__.update().where(
+        ConsultantTimeSlot.__table__.c.slot_id.in_([slot.slot_id for slot in slots])
+    ).values(is_available=False))
+    db.session.commit()
+    return consultant_ids, user_ids
+
+
+def scanned_tables(connection, statement, parameters):
+    """Tables a statement reads in full, according to the database's EXPLAIN."""
+    if connection.dialect.name == 'sqlite':
+        plan = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        details = [row[3] for row in plan]
+        scans = {match.group(1) for detail in details for match in [re.match(r'SCAN (\w+)', detail)] if match}
+        return scans, details
+    plan = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings().all()
+    details = [f"{row['table']}: type={row['type']} key={row['key']}" for row in plan]
+    return {row['table'] for row in plan if row['type'] in ('ALL', 'index')}, details
+
+
+class Check:
+    def __init__(self, name, run, allow=None):
+        self.name = name
+        self.run = run
+        # {table: reason} scans accepted even though the statement is filtered
+        self.allow = allow or {}
+
+
+def build_checks(app, consultant_ids, user_ids):
+    with app.app_context():
+        admin_id = db.session.query(Admin.id).scalar()
+        student_token = create_access_token(identity=str(user_ids[0]), additional_claims={'user_type': 'user'})
+        consultant_token = create_access_token(identity=str(consultant_ids[0]), additional_claims={'user_type': 'consultant'})
+        admin_token = create_access_token(identity=str(admin_id), additional_claims={'user_type': 'admin'})
+        free_slot = db.session.query(ConsultantTimeSlot.slot_id).filter(
+            ConsultantTimeSlot.consultant_id == consultant_ids[-1],
+            ConsultantTimeSlot.is_available == True,
+            ConsultantTimeSlot.date >= date.today()
+        ).first().slot_id
+
+    # No cookie jar: the login check's access cookie would override the Authorization headers
+    client = app.test_client(use_cookies=False)
+    state = {}
+    day = (date.today() + timedelta(days=1)).strftime('%Y-%m-%d')
+    week_end = (date.today() + timedelta(days=7)).strftime('%Y-%m-%d')
+
+    def get(path, token):
+        response = client.get(path, headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200, (path, response.status_code)
+
+    def create_booking():
+        response = client.post('/api/booking/createBooking', json={'time_slot_id': free_slot},
+                               headers={'Authorization': f'Bearer {student_token}'})
+        assert response.status_code == 201, response.get_json()
+        state['booking_id'] = response.get_json()['booking_id']
+
+    def process_payment():
+        response = client.post('/api/booking/payment/process', json={
+            'booking_id': state['booking_id'], 'card_number': '4111111111111111', 'expiry_month': 12,
+            'expiry_year': 2030, 'cvv': '123', 'cardholder_name': 'Check'
+        }, headers={'Authorization': f'Bearer {student_token}'})
+        assert response.status_code == 200, response.get_json()
+
+    def cancel_booking():
+        with app.app_context():
+            consultant_id = db.session.get(Booking, state['booking_id']).consultant_id
+            token = create_access_token(identity=str(consultant_id), additional_claims={'user_type': 'consultant'})
+        response = client.patch(f"/api/booking/{state['booking_id']}/status", json={'status': 'Cancelled'},
+                                headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 200, response.get_json()
+
+    def login():
+        response = client.post('/api/auth/login', json={'email': 'admin@example.com', 'password': 'password123'})
+        assert response.status_code == 200, response.get_json()
+
+    def job(fn, **kwargs):
+        def run():
+            with app.app_context():
+                fn(**kwargs)
+        return run
+
+    cid = consultant_ids[0]
+    return [
+        Check('login', login),
+        Check('timeslots, all days', lambda: get(f'/api/booking/consultants/{cid}/timeslots', student_token)),
+        Check('timeslots, one day', lambda: get(f'/api/booking/consultants/{cid}/timeslots?date={day}', student_token)),
+        Check('availability batch', lambda: get(
+            f"/api/booking/availability?consultant_ids={','.join(map(str, consultant_ids[:10]))}"
+            f"&start_date={day}&end_date={week_end}", student_token)),
+        Check('consultant directory, filtered page', lambda: get(
+            '/api/consultation/getConsultantDetails?presence=Online&fields=id,name&after=0&limit=20', student_token)),
+        Check('create booking', create_booking),
+        Check('process payment', process_payment),
+        Check('cancel booking', cancel_booking),
+        Check('consultant getBookings', lambda: get(f'/api/booking/consultants/{cid}/getBookings', consultant_token)),
+        Check('consultant getBookings, filtered page', lambda: get(
+            f'/api/booking/consultants/{cid}/getBookings?status=Confirmed&start_date={day}&end_date={week_end}'
+            f'&after=0&limit=20', consultant_token)),
+        Check('admin getBookings, page', lambda: get('/api/admin/getBookings?after=0&limit=100', admin_token)),
+        Check('admin analytics overview', lambda: get('/api/admin/analytics/overview', admin_token)),
+        Check('admin analytics consultants', lambda: get('/api/admin/analytics/consultants', admin_token)),
+        Check('admin analytics consultants, window', lambda: get(
+            f'/api/admin/analytics/consultants?start_date={day}&end_date={week_end}', admin_token), allow={
+            # The report lists every consultant; the window only narrows the slots counted
+            'consultants': 'report covers all consultants',
+        }),
+        Check('analytics rollup rebuild', job(refresh_rollups, full=True)),
+        Check('analytics rollup refresh', job(refresh_rollups)),
+        Check('admin analytics bookings', lambda: get('/api/admin/analytics/bookings', admin_token)),
+        Check('admin analytics users', lambda: get('/api/admin/analytics/users', admin_token)),
+        Check('slot generation', job(generate_consultant_time_slots, num_weeks=5)),
+        Check('slot horizon roll', job(roll_slot_horizon, weeks=6, batch_size=20)),
+        Check('prune expired slots', job(prune_expired_slots)),
+        Check('sweep expired holds', job(release_expired_holds, now=datetime.now() + timedelta(hours=1))),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default='sqlite://')
+    parser.add_argument('--consultants', type=int, default=50)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--bookings', type=int, default=2000)
+    parser.add_argument('--verbose', action='store_true', help='Print the plan of every statement.')
+    args = parser.parse_args()
+
+    class CheckConfig(Config):
+        SQLALCHEMY_DATABASE_URI = args.database_url
+        BCRYPT_LOG_ROUNDS = 4
+
+    app = create_app(CheckConfig)
+    with app.app_context():
+        consultant_ids, user_ids = seed(args.consultants, args.users, args.bookings)
+        # Give the planner real statistics, as a production database has
+        if db.engine.dialect.name == 'mysql':
+            for table in db.metadata.sorted_tables:
+                db.session.execute(db.text(f'ANALYZE TABLE {table.name}'))
+        else:
+            db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+        row_counts = {
+            table.name: db.session.execute(db.select(db.func.count()).select_from(table)).scalar()
+            for table in db.metadata.sorted_tables
+        }
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, parameters, context, executemany:
+                     statements.append((statement, parameters[0] if executemany else parameters)))
+    checks = build_checks(app, consultant_ids, user_ids)
+
+    failures = 0
+    for check in checks:
+        with app.app_context():
+            availability_cache().clear()
+        statements.clear()
+        check.run()
+        captured = [(sql, params) for sql, params in statements if sql.lstrip().upper().startswith(EXPLAINABLE)]
+
+        problems = []
+        with app.app_context(), db.engine.connect() as connection:
+            for sql, params in captured:
+                scans, plan = scanned_tables(connection, sql, params)
+                filtered = re.search(r'\bWHERE\b', sql, re.IGNORECASE) is not None
+                bad = {
+                    table for table in scans
+                    if filtered and table not in check.allow and row_counts.get(table, SMALL_TABLE_ROWS) >= SMALL_TABLE_ROWS
+                }
+                if bad:
+                    problems.append((sql, plan, bad))
+                elif args.verbose:
+                    label = 'whole-table' if scans and not filtered else ('allowlisted' if scans else 'indexed')
+                    print(f"  [{label}] {' '.join(sql.split())[:140]}")
+                    for line in plan:
+                        print(f"      {line}")
+
+        status = 'FAIL' if problems else 'ok'
+        print(f"{status:<5} {check.name:<40} {len(captured):>3} statements")
+        for sql, plan, bad in problems:
+            failures += 1
+            print(f"      full scan of {', '.join(sorted(bad))}: {' '.join(sql.split())[:200]}")
+            for line in plan:
+                print(f"        {line}")
+
+    if failures:
+        print(f"{failures} statement(s) fall back to a full scan")
+        sys.exit(1)
+    print('All filtered statements use an index')
+
+
+if __name__ == '__main__':
+    main()
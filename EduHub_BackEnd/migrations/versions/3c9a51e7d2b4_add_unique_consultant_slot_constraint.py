@@ -0,0 +1,115 @@
+"""Add unique (consultant_id, date, start_time) constraint to consultant_time_slot
+
+Revision ID: 3c9a51e7d2b4
+Revises: 202507080942
+Create Date: 2026-10-16 09:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9a51e7d2b4'
+down_revision = '202507080942'
+branch_labels = None
+depends_on = None
+
+
+slots = sa.table(
+    'consultant_time_slot',
+    sa.column('slot_id', sa.Integer),
+    sa.column('consultant_id', sa.Integer),
+    sa.column('date', sa.Date),
+    sa.column('start_time', sa.String)
+)
+bookings = sa.table(
+    'bookings',
+    sa.column('booking_id', sa.Integer),
+    sa.column('time_slot_id', sa.Integer),
+    sa.column('status', sa.String)
+)
+
+
+def _merge_duplicate_slots(bind):
+    """
+    Collapse duplicate (consultant_id, date, start_time) slots left by concurrent generator runs.
+
+    Each group keeps one slot, preferring one with an active (non-cancelled)
+    booking, then one with any booking, then the oldest. Bookings of the other
+    copies are repointed to it before they are deleted. A group with more than
+    one active booking is a real double booking and aborts the upgrade before
+    anything is written.
+    """
+    group_key = (slots.c.consultant_id, slots.c.date, slots.c.start_time)
+    duplicated = (
+        sa.select(*group_key)
+        .group_by(*group_key)
+        .having(sa.func.count() > 1)
+        .subquery()
+    )
+    rows = bind.execute(
+        sa.select(slots.c.slot_id, *group_key)
+        .join(duplicated, sa.and_(
+            slots.c.consultant_id == duplicated.c.consultant_id,
+            slots.c.date == duplicated.c.date,
+            slots.c.start_time == duplicated.c.start_time
+        ))
+        .order_by(slots.c.slot_id)
+    ).all()
+    if not rows:
+        return
+
+    groups = {}
+    for slot_id, consultant_id, date, start_time in rows:
+        groups.setdefault((consultant_id, date, start_time), []).append(slot_id)
+    booked = {}
+    for booking_id, time_slot_id, status in bind.execute(
+        sa.select(bookings.c.booking_id, bookings.c.time_slot_id, bookings.c.status)
+        .where(bookings.c.time_slot_id.in_([row.slot_id for row in rows]))
+    ):
+        booked.setdefault(time_slot_id, []).append((booking_id, status != 'Cancelled'))
+
+    plan, conflicts = [], []
+    for (consultant_id, date, start_time), slot_ids in groups.items():
+        active = [booking_id for slot_id in slot_ids for booking_id, is_active in booked.get(slot_id, []) if is_active]
+        if len(active) > 1:
+            conflicts.append(
+                f"consultant {consultant_id} on {date} at {start_time}: "
+                f"slots {', '.join(map(str, slot_ids))}, active bookings {', '.join(map(str, active))}"
+            )
+            continue
+        keep = min(slot_ids, key=lambda slot_id: (
+            not any(is_active for _, is_active in booked.get(slot_id, [])),
+            slot_id not in booked,
+            slot_id
+        ))
+        plan.append((keep, [slot_id for slot_id in slot_ids if slot_id != keep]))
+    if conflicts:
+        raise RuntimeError(
+            "Cannot add uq_consultant_time_slot_start: these slots are double booked. "
+            "Cancel all but one active booking per slot, then rerun the upgrade.\n  " + "\n  ".join(conflicts)
+        )
+
+    for keep, duplicates in plan:
+        bind.execute(
+            bookings.update().where(bookings.c.time_slot_id.in_(duplicates)).values(time_slot_id=keep)
+        )
+        bind.execute(slots.delete().where(slots.c.slot_id.in_(duplicates)))
+
+
+def upgrade():
+    _merge_duplicate_slots(op.get_bind())
+
+    with op.batch_alter_table('consultant_time_slot', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_consultant_time_slot_start', ['consultant_id', 'date', 'start_time'])
+
+
+def downgrade():
+    with op.batch_alter_table('consultant_time_slot', schema=None) as batch_op:
+        if op.get_bind().dialect.name == 'mysql':
+            # MySQL dropped the implicit index behind the consultant_id foreign key when
+            # the constraint below was created, and refuses to drop the last index a
+            # foreign key can use (error 1553): put the plain one back first
+            batch_op.create_index('consultant_id', ['consultant_id'], unique=False)
+        batch_op.drop_constraint('uq_consultant_time_slot_start', type_='unique')
@@ -0,0 +1,81 @@
+"""Add bookings.active_time_slot_id with a unique constraint (one live booking per slot)
+
+Revision ID: 5f1b9c3e7a22
+Revises: 8d4e2f6a1b07
+Create Date: 2026-10-16 11:41:09.264871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f1b9c3e7a22'
+down_revision = '8d4e2f6a1b07'
+branch_labels = None
+depends_on = None
+
+
+bookings = sa.table(
+    'bookings',
+    sa.column('booking_id', sa.Integer),
+    sa.column('time_slot_id', sa.Integer),
+    sa.column('status', sa.String)
+)
+
+
+def _check_double_bookings(bind):
+    """
+    Abort if any slot has more than one live (non-cancelled) booking.
+
+    Such slots come from the old read-then-write race. Only one booking per
+    slot can hold the claim, so rather than picking a winner here the upgrade
+    lists them and stops before anything is written, as 3c9a51e7d2b4 does.
+    """
+    live = sa.or_(bookings.c.status.is_(None), bookings.c.status != 'Cancelled')
+    doubled = (
+        sa.select(bookings.c.time_slot_id)
+        .where(live)
+        .group_by(bookings.c.time_slot_id)
+        .having(sa.func.count() > 1)
+    )
+    rows = bind.execute(
+        sa.select(bookings.c.time_slot_id, bookings.c.booking_id)
+        .where(live, bookings.c.time_slot_id.in_(doubled))
+        .order_by(bookings.c.time_slot_id, bookings.c.booking_id)
+    ).all()
+    if not rows:
+        return
+
+    groups = {}
+    for time_slot_id, booking_id in rows:
+        groups.setdefault(time_slot_id, []).append(booking_id)
+    raise RuntimeError(
+        "Cannot add uq_bookings_active_time_slot_id: these slots are double booked. "
+        "Cancel all but one active booking per slot, then rerun the upgrade.\n  " + "\n  ".join(
+            f"slot {time_slot_id}: active bookings {', '.join(map(str, booking_ids))}"
+            for time_slot_id, booking_ids in groups.items()
+        )
+    )
+
+
+def upgrade():
+    _check_double_bookings(op.get_bind())
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('active_time_slot_id', sa.Integer(), nullable=True))
+
+    # Every live booking now has its slot to itself, so all of them take the claim
+    op.execute("""
+        UPDATE bookings SET active_time_slot_id = time_slot_id
+        WHERE status IS NULL OR status <> 'Cancelled'
+    """)
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_bookings_active_time_slot_id', ['active_time_slot_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_bookings_active_time_slot_id', type_='unique')
+        batch_op.drop_column('active_time_slot_id')
@@ -0,0 +1,76 @@
+"""Add the areas vocabulary and user_interests, backfilled from users.areas_of_interest
+
+Revision ID: a9d2c6e4f871
+Revises: e1f7a3c95b20
+Create Date: 2026-10-16 21:12:40.381526
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d2c6e4f871'
+down_revision = 'e1f7a3c95b20'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade():
+    op.create_table('areas',
+    sa.Column('area_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('label', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('area_id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('user_interests',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('area_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['area_id'], ['areas.area_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'area_id')
+    )
+    with op.batch_alter_table('user_interests', schema=None) as batch_op:
+        batch_op.create_index('ix_user_interests_area_id', ['area_id'], unique=False)
+
+    # Backfill: same normalization as app.utils.interests.parse_areas (strip,
+    # lowercase key, blanks dropped, first spelling kept as the label)
+    bind = op.get_bind()
+    users = sa.table('users', sa.column('id', sa.Integer), sa.column('areas_of_interest', sa.String))
+    areas = sa.table('areas', sa.column('area_id', sa.Integer), sa.column('name', sa.String), sa.column('label', sa.String))
+    user_interests = sa.table('user_interests', sa.column('user_id', sa.Integer), sa.column('area_id', sa.Integer))
+
+    labels = {}
+    user_areas = []
+    rows = bind.execute(
+        sa.select(users.c.id, users.c.areas_of_interest).where(users.c.areas_of_interest.isnot(None))
+    ).all()
+    for user_id, areas_of_interest in rows:
+        names = []
+        for part in areas_of_interest.split(','):
+            label = part.strip()
+            name = label.lower()
+            if label and name not in names:
+                names.append(name)
+                labels.setdefault(name, label)
+        user_areas.append((user_id, names))
+
+    if labels:
+        bind.execute(areas.insert(), [{'name': name, 'label': label} for name, label in labels.items()])
+    area_ids = dict(bind.execute(sa.select(areas.c.name, areas.c.area_id)).all())
+    links = [
+        {'user_id': user_id, 'area_id': area_ids[name]}
+        for user_id, names in user_areas for name in names
+    ]
+    for start in range(0, len(links), BATCH_SIZE):
+        bind.execute(user_interests.insert(), links[start:start + BATCH_SIZE])
+
+
+def downgrade():
+    # Dropping the table removes ix_user_interests_area_id with it; dropping the
+    # index first fails on MySQL, where it is the only index the area_id foreign key can use
+    op.drop_table('user_interests')
+    op.drop_table('areas')
@@ -0,0 +1,28 @@
+"""Add bookings.hold_expires_at for expiring payment holds
+
+Revision ID: b7e3d91c4f58
+Revises: 5f1b9c3e7a22
+Create Date: 2026-10-16 14:05:37.118402
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3d91c4f58'
+down_revision = '5f1b9c3e7a22'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hold_expires_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_bookings_hold_expires_at'), ['hold_expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_bookings_hold_expires_at'))
+        batch_op.drop_column('hold_expires_at')
@@ -0,0 +1,52 @@
+"""Add composite indexes for the booking, slot and analytics query shapes
+
+Revision ID: c4a8e2f19d63
+Revises: b7e3d91c4f58
+Create Date: 2026-10-16 16:22:48.530917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a8e2f19d63'
+down_revision = 'b7e3d91c4f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('consultant_time_slot', schema=None) as batch_op:
+        batch_op.create_index('ix_consultant_time_slot_consultant_available', ['consultant_id', 'is_available', 'date'], unique=False)
+        batch_op.create_index('ix_consultant_time_slot_date_available', ['date', 'is_available'], unique=False)
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_consultant_status', ['consultant_id', 'status'], unique=False)
+        batch_op.create_index('ix_bookings_time_slot_id', ['time_slot_id'], unique=False)
+        batch_op.create_index('ix_bookings_status', ['status'], unique=False)
+        batch_op.create_index('ix_bookings_booking_date', ['booking_date'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_created_at'))
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        if op.get_bind().dialect.name == 'mysql':
+            # MySQL dropped the implicit indexes behind the consultant_id and time_slot_id
+            # foreign keys when the indexes below were created, and refuses to drop the
+            # last index a foreign key can use (error 1553): put the plain ones back first
+            batch_op.create_index('consultant_id', ['consultant_id'], unique=False)
+            batch_op.create_index('time_slot_id', ['time_slot_id'], unique=False)
+        batch_op.drop_index('ix_bookings_booking_date')
+        batch_op.drop_index('ix_bookings_status')
+        batch_op.drop_index('ix_bookings_time_slot_id')
+        batch_op.drop_index('ix_bookings_consultant_status')
+
+    with op.batch_alter_table('consultant_time_slot', schema=None) as batch_op:
+        batch_op.drop_index('ix_consultant_time_slot_date_available')
+        batch_op.drop_index('ix_consultant_time_slot_consultant_available')
@@ -0,0 +1,32 @@
+"""Add row_hash to program and university for incremental catalog imports
+
+Revision ID: d3b8f05a7c16
+Revises: a9d2c6e4f871
+Create Date: 2026-10-16 21:58:03.926144
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3b8f05a7c16'
+down_revision = 'a9d2c6e4f871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('program', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('row_hash', sa.String(length=16), nullable=True))
+
+    with op.batch_alter_table('university', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('row_hash', sa.String(length=16), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('university', schema=None) as batch_op:
+        batch_op.drop_column('row_hash')
+
+    with op.batch_alter_table('program', schema=None) as batch_op:
+        batch_op.drop_column('row_hash')
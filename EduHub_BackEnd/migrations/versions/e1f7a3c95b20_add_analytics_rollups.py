@@ -0,0 +1,90 @@
+"""Add daily analytics rollup tables and bookings.updated_at
+
+Revision ID: e1f7a3c95b20
+Revises: c4a8e2f19d63
+Create Date: 2026-10-16 17:48:12.604117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f7a3c95b20'
+down_revision = 'c4a8e2f19d63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('booking_daily_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('booking_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('booking_daily_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_booking_daily_stats_day'), ['day'], unique=False)
+
+    op.create_table('booking_start_time_daily_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('start_time', sa.String(length=10), nullable=False),
+    sa.Column('booking_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('booking_start_time_daily_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_booking_start_time_daily_stats_day'), ['day'], unique=False)
+
+    op.create_table('registration_daily_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('degree_level', sa.String(length=50), nullable=True),
+    sa.Column('mode', sa.String(length=50), nullable=True),
+    sa.Column('user_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('registration_daily_stats', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_registration_daily_stats_day'), ['day'], unique=False)
+
+    op.create_table('analytics_rollup_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.Column('closed_through', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Added without a default so existing rows can be backfilled first (SQLite
+    # cannot add a column whose default is CURRENT_TIMESTAMP)
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE bookings SET updated_at = booking_date')
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), server_default=sa.func.now())
+        batch_op.create_index('ix_bookings_updated_at', ['updated_at'], unique=False)
+        # Covering index for live status counts since the rollups' last closed day; all-time
+        # status counts now come from the rollups, so the status-only index has no reader left
+        batch_op.drop_index('ix_bookings_booking_date')
+        batch_op.drop_index('ix_bookings_status')
+        batch_op.create_index('ix_bookings_booking_date_status', ['booking_date', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_booking_date_status')
+        batch_op.create_index('ix_bookings_status', ['status'], unique=False)
+        batch_op.create_index('ix_bookings_booking_date', ['booking_date'], unique=False)
+        batch_op.drop_index('ix_bookings_updated_at')
+        batch_op.drop_column('updated_at')
+
+    op.drop_table('analytics_rollup_watermarks')
+    with op.batch_alter_table('registration_daily_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_registration_daily_stats_day'))
+    op.drop_table('registration_daily_stats')
+    with op.batch_alter_table('booking_start_time_daily_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_start_time_daily_stats_day'))
+    op.drop_table('booking_start_time_daily_stats')
+    with op.batch_alter_table('booking_daily_stats', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_booking_daily_stats_day'))
+    op.drop_table('booking_daily_stats')
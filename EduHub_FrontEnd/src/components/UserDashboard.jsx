@@ -230,7 +230,9 @@ const EducationConsultancyApp = () => {
     setTimeSlotsError(null);
     
     try {
-      const response = await fetch(`http://127.0.0.1:5000/api/booking/consultants/${consultantId}/timeslots`, {
+      // Ask for the selected day only; the response carries an ETag, so repeat clicks revalidate cheaply
+      const dateStr = selectedDate.toISOString().split('T')[0];
+      const response = await fetch(`http://127.0.0.1:5000/api/booking/consultants/${consultantId}/timeslots?date=${dateStr}`, {
         method: 'GET',
         headers: {
           'Authorization': `Bearer ${localStorage.getItem('access_token')}`,
@@ -246,7 +248,6 @@ const EducationConsultancyApp = () => {
       const allSlots = data.timeslots || [];
       
       // Filter slots by the selected date on the frontend
-      const dateStr = selectedDate.toISOString().split('T')[0];
       const filteredSlots = allSlots.filter(slot => {
         // Assuming the slot has a date field or we can extract date from slot data
         // Adjust this logic based on your actual slot data structure